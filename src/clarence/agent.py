@@ -1,13 +1,91 @@
+import asyncio
+import hashlib
 import json
 from datetime import datetime
 
+import orjson
+from anthropic.types import ToolParam
+from prompt_toolkit import PromptSession
+
 from clarence.mcp_client import AlpacaMCPClient
-from clarence.model import call_llm, call_llm_stream
+from clarence.model import call_llm_stream, stream_llm_message
 from clarence.prompts import get_system_prompt, ANSWER_PROMPT
 from clarence.risk import get_risk_parameters, RiskParameters
 from clarence.scanner import OpportunityScanner
+from clarence.tools.finance.metrics import aget_financial_metrics, aget_financial_metrics_snapshot
+from clarence.tools.finance.news import aget_news
 from clarence.utils.logger import Logger
 
+# Timeout for each local (read-only HTTP) tool so one slow lookup doesn't stall
+# the concurrent batch; MCP calls run in order with no timeout (see run())
+TOOL_TIMEOUT = 30.0
+
+# Local finance tools as Anthropic-format tool definitions
+_LOCAL_TOOLS: tuple[ToolParam, ...] = (
+    {
+        "name": "get_news",
+        "description": "Retrieve recent news articles for a stock ticker.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "ticker": {"type": "string", "description": "Stock ticker symbol"},
+                "limit": {"type": "integer", "description": "Number of articles (default 5)"},
+            },
+            "required": ["ticker"],
+        },
+    },
+    {
+        "name": "get_financial_metrics_snapshot",
+        "description": "Fetch current financial metrics snapshot for a company (P/E, market cap, etc).",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "ticker": {"type": "string", "description": "Stock ticker symbol"},
+            },
+            "required": ["ticker"],
+        },
+    },
+    {
+        "name": "get_financial_metrics",
+        "description": "Retrieve historical financial metrics for a company.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "ticker": {"type": "string", "description": "Stock ticker symbol"},
+                "period": {"type": "string", "description": "Period: annual, quarterly, or ttm"},
+                "limit": {"type": "integer", "description": "Number of records"},
+            },
+            "required": ["ticker"],
+        },
+    },
+)
+
+LOCAL_TOOL_NAMES = frozenset(t["name"] for t in _LOCAL_TOOLS)
+
+
+async def _dispatch_news(args: dict) -> list:
+    return await aget_news(ticker=args.get("ticker", ""), limit=args.get("limit", 5))
+
+
+async def _dispatch_snapshot(args: dict) -> dict:
+    return await aget_financial_metrics_snapshot(ticker=args.get("ticker", ""))
+
+
+async def _dispatch_metrics(args: dict) -> list:
+    return await aget_financial_metrics(
+        ticker=args.get("ticker", ""),
+        period=args.get("period", "ttm"),
+        limit=args.get("limit", 4),
+    )
+
+
+# Local tool name -> async handler taking the raw tool input
+_LOCAL_DISPATCH = {
+    "get_news": _dispatch_news,
+    "get_financial_metrics_snapshot": _dispatch_snapshot,
+    "get_financial_metrics": _dispatch_metrics,
+}
+
 
 class Agent:
     """Two-mode async agent: /scan for opportunities, free-form for Q&A."""
@@ -17,10 +95,19 @@ class Agent:
         self.risk_level = risk_level
         self.risk_params = get_risk_parameters(risk_level)
         self.logger = Logger()
+        self._run_cache: dict = {}
+        self._system_prompt = get_system_prompt()
+        self._all_tools: list[ToolParam] | None = None
+        # Set by the CLI so scan approvals share the REPL's prompt history
+        self.session: PromptSession | None = None
+        self._scanner: OpportunityScanner | None = None
 
     async def scan(self):
         """Scan for day trading opportunities, present them, and execute confirmed trades."""
-        scanner = OpportunityScanner(self.mcp, self.risk_params, self.logger)
+        # Reuse the scanner (and its pre-formatted prompt) until risk changes
+        if self._scanner is None or self._scanner.risk_params is not self.risk_params:
+            self._scanner = OpportunityScanner(self.mcp, self.risk_params, self.logger)
+        scanner = self._scanner
         recommendations = await scanner.scan()
 
         if not recommendations:
@@ -29,12 +116,14 @@ class Agent:
 
         self.logger._log(f"\nFound {len(recommendations)} opportunities:\n")
 
+        session = self.session or PromptSession()
+
         for rec in recommendations:
             # Present the opportunity
             await scanner.present_opportunity(rec)
 
             # Get user approval
-            approval = await _get_user_approval(rec)
+            approval = await _get_user_approval(rec, session)
 
             if approval == "yes":
                 self.logger._log(f"\nPlacing order for {rec.quantity} shares of {rec.symbol}...")
@@ -53,109 +142,87 @@ class Agent:
     async def run(self, query: str):
         """Q&A loop: send query + tools to Claude, route tool calls, iterate."""
         self.logger.ui.print_user_query(query)
+        self._run_cache = {}
 
-        # Build tool list from MCP
-        mcp_tools = await self.mcp.get_tools()
-
-        # Add local finance tools as Anthropic-format tool definitions
-        local_tools = [
-            {
-                "name": "get_news",
-                "description": "Retrieve recent news articles for a stock ticker.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "ticker": {"type": "string", "description": "Stock ticker symbol"},
-                        "limit": {"type": "integer", "description": "Number of articles (default 5)"},
-                    },
-                    "required": ["ticker"],
-                },
-            },
-            {
-                "name": "get_financial_metrics_snapshot",
-                "description": "Fetch current financial metrics snapshot for a company (P/E, market cap, etc).",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "ticker": {"type": "string", "description": "Stock ticker symbol"},
-                    },
-                    "required": ["ticker"],
-                },
-            },
-            {
-                "name": "get_financial_metrics",
-                "description": "Retrieve historical financial metrics for a company.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "ticker": {"type": "string", "description": "Stock ticker symbol"},
-                        "period": {"type": "string", "description": "Period: annual, quarterly, or ttm"},
-                        "limit": {"type": "integer", "description": "Number of records"},
-                    },
-                    "required": ["ticker"],
-                },
-            },
-        ]
-
-        all_tools = mcp_tools + local_tools
+        # MCP tools are stable for the session, so build the full list once
+        if self._all_tools is None:
+            mcp_tools = await self.mcp.get_tools()
+            self._all_tools = mcp_tools + list(_LOCAL_TOOLS)
+        all_tools = self._all_tools
 
         messages = [{"role": "user", "content": query}]
-        system = get_system_prompt()
+        system = self._system_prompt
 
-        last_actions = []
+        # Fingerprints of the two most recent tool calls, for loop detection
+        last_sig1 = last_sig2 = None
         max_steps = 10
 
         for step in range(max_steps):
-            response = await call_llm(messages=messages, system=system, tools=all_tools)
+            # Stream every turn so text reaches the user as it is generated; the
+            # final Message then tells us whether Claude also asked for tools
+            stream = stream_llm_message(messages=_compact_messages(messages), system=system, tools=all_tools)
+            await self.logger.ui.async_stream_answer(stream)
+            response = stream.message
 
             # If Claude responded with text only, we're done
             if response.stop_reason == "end_turn":
-                text = _extract_text(response)
-                if text:
-                    self.logger.ui.print_answer(text)
                 return
 
             # Process tool calls
             tool_blocks = [b for b in response.content if b.type == "tool_use"]
             if not tool_blocks:
-                text = _extract_text(response)
-                if text:
-                    self.logger.ui.print_answer(text)
                 return
 
             # Append assistant message
             messages.append({"role": "assistant", "content": response.content})
 
-            # Execute each tool call
-            tool_results = []
+            # Loop detection runs as a pre-pass so only fresh calls are dispatched
+            pending = []
+            results_by_id = {}
             for block in tool_blocks:
-                tool_name = block.name
-                tool_input = block.input
-
-                # Loop detection
-                action_sig = f"{tool_name}:{json.dumps(tool_input, sort_keys=True)}"
-                last_actions.append(action_sig)
-                if len(last_actions) > 3:
-                    last_actions = last_actions[-3:]
-                if len(set(last_actions)) == 1 and len(last_actions) == 3:
+                sig = _tool_key(block.name, block.input)
+                is_loop = sig == last_sig1 == last_sig2
+                last_sig2, last_sig1 = last_sig1, sig
+                if is_loop:
                     self.logger._log("Detected repeating action loop — stopping.")
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": block.id,
-                        "content": "Error: Action loop detected. Please try a different approach.",
-                    })
+                    results_by_id[block.id] = "Error: Action loop detected. Please try a different approach."
                     continue
-
-                # Route tool call
-                result_text = await self._call_tool(tool_name, tool_input)
-                self.logger.ui.print_tool_params(f"{tool_name}({json.dumps(tool_input)})")
+                pending.append(block)
+
+            # Read-only local lookups run concurrently under a timeout. MCP calls
+            # (which include order placement) run one at a time, in order, with no
+            # cancelling timeout: a cancelled request may already have executed
+            # server-side, and reporting it as timed out invites a duplicate order.
+            local = [b for b in pending if b.name in LOCAL_TOOL_NAMES]
+            remote = [b for b in pending if b.name not in LOCAL_TOOL_NAMES]
+            local_results, remote_results = await asyncio.gather(
+                asyncio.gather(
+                    *[asyncio.wait_for(self._call_tool(b.name, b.input), TOOL_TIMEOUT) for b in local],
+                    return_exceptions=True,
+                ),
+                self._call_tools_in_order(remote),
+            )
+            outcomes = {b.id: r for b, r in zip(local + remote, local_results + remote_results)}
+            for block in pending:
+                result = outcomes[block.id]
+                if isinstance(result, asyncio.TimeoutError):
+                    result_text = f"Error: {block.name} timed out after {TOOL_TIMEOUT:.0f}s"
+                elif isinstance(result, Exception):
+                    result_text = f"Error: {type(result).__name__}: {result}"
+                else:
+                    result_text = result
+                self.logger.ui.print_tool_params(f"{block.name}({_to_json(block.input)})")
                 self.logger.ui.print_tool_run(result_text[:200] if result_text else "")
+                results_by_id[block.id] = result_text
 
-                tool_results.append({
+            tool_results = [
+                {
                     "type": "tool_result",
                     "tool_use_id": block.id,
-                    "content": result_text,
-                })
+                    "content": results_by_id[block.id],
+                }
+                for block in tool_blocks
+            ]
 
             messages.append({"role": "user", "content": tool_results})
 
@@ -164,53 +231,141 @@ class Agent:
             "role": "user",
             "content": "Maximum tool calls reached. Please summarize what you've found so far.",
         })
-        response = await call_llm(messages=messages, system=system)
-        text = _extract_text(response)
-        if text:
-            self.logger.ui.print_answer(text)
+        # Tools are still sent so the history's tool blocks validate, but
+        # tool_choice none guarantees a text summary rather than another call
+        stream = call_llm_stream(
+            messages=_compact_messages(messages), system=system, tools=all_tools, tool_choice={"type": "none"}
+        )
+        await self.logger.ui.async_stream_answer(stream)
 
     async def _call_tool(self, name: str, args: dict) -> str:
         """Route a tool call to MCP or local functions."""
-        if name == "get_news":
-            from clarence.tools.finance.news import get_news
-            result = get_news(
-                ticker=args.get("ticker", ""),
-                limit=args.get("limit", 5),
-            )
-            return json.dumps(result, default=str)
-
-        if name == "get_financial_metrics_snapshot":
-            from clarence.tools.finance.metrics import get_financial_metrics_snapshot
-            result = get_financial_metrics_snapshot(ticker=args.get("ticker", ""))
-            return json.dumps(result, default=str)
-
-        if name == "get_financial_metrics":
-            from clarence.tools.finance.metrics import get_financial_metrics
-            result = get_financial_metrics(
-                ticker=args.get("ticker", ""),
-                period=args.get("period", "ttm"),
-                limit=args.get("limit", 4),
-            )
-            return json.dumps(result, default=str)
+        if name in LOCAL_TOOL_NAMES:
+            # Dedupe identical local lookups within a run; MCP calls (which
+            # include order placement) are never memoized.
+            key = _tool_key(name, args)
+            task = self._run_cache.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._call_local_tool(name, args))
+                task.add_done_callback(_consume_exception)
+                self._run_cache[key] = task
+            try:
+                return await asyncio.shield(task)
+            except BaseException:
+                # Failed, or this waiter timed out (the shielded task keeps
+                # running): don't let later identical calls reuse it
+                if self._run_cache.get(key) is task:
+                    del self._run_cache[key]
+                raise
 
         # Default: route to MCP
         return await self.mcp.call_tool(name, args)
 
+    async def _call_tools_in_order(self, blocks: list) -> list:
+        """Run tool calls sequentially, returning each result or exception."""
+        results = []
+        for block in blocks:
+            try:
+                results.append(await self._call_tool(block.name, block.input))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def _call_local_tool(self, name: str, args: dict) -> str:
+        """Run a local finance tool and serialize the result."""
+        handler = _LOCAL_DISPATCH.get(name)
+        if handler is None:
+            raise ValueError(f"Unknown local tool: {name}")
+        result = await handler(args)
+        return _to_json(result)
+
+
+def _consume_exception(task: asyncio.Future):
+    """Retrieve a cached task's exception so an abandoned failure isn't logged as unhandled."""
+    if not task.cancelled():
+        task.exception()
+
+
+def _compact_messages(
+    messages: list[dict],
+    max_tool_chars: int = 2000,
+    keep_recent: int = 2,
+    max_total_chars: int = 50_000,
+) -> list[dict]:
+    """Return a compacted copy of the Q&A history to resend to Claude.
+
+    The last `keep_recent` tool-result turns are sent verbatim. Older tool
+    results are cut to a head plus a hash marker, and text blocks are
+    dropped from all but the latest assistant turn (tool_use blocks are
+    kept so every tool_result still has its pair). If the history is still
+    over `max_total_chars`, recent tool results are truncated as well.
+    """
+    tool_turns = [
+        i for i, m in enumerate(messages)
+        if m["role"] == "user" and isinstance(m["content"], list)
+    ]
+    old_turns = set(tool_turns[:-keep_recent]) if keep_recent else set(tool_turns)
+    assistant_turns = [i for i, m in enumerate(messages) if m["role"] == "assistant"]
+    last_assistant = assistant_turns[-1] if assistant_turns else -1
+
+    compacted = []
+    for i, m in enumerate(messages):
+        if i in old_turns:
+            m = {**m, "content": [_truncate_tool_result(b, max_tool_chars) for b in m["content"]]}
+        elif m["role"] == "assistant" and i != last_assistant:
+            m = {**m, "content": [b for b in m["content"] if _block_type(b) != "text"]}
+        compacted.append(m)
+
+    total = sum(
+        len(b.get("content", ""))
+        for m in compacted if isinstance(m["content"], list)
+        for b in m["content"] if isinstance(b, dict)
+    )
+    if total > max_total_chars:
+        compacted = [
+            {**m, "content": [_truncate_tool_result(b, max_tool_chars) for b in m["content"]]}
+            if i in tool_turns else m
+            for i, m in enumerate(compacted)
+        ]
+    return compacted
+
 
-def _extract_text(response) -> str:
-    """Extract text content from an Anthropic Message response."""
-    parts = []
-    for block in response.content:
-        if hasattr(block, "text"):
-            parts.append(block.text)
-    return "\n".join(parts)
+def _truncate_tool_result(block: dict, max_chars: int) -> dict:
+    """Cut a tool_result block's text to `max_chars`, noting what was elided."""
+    content = block.get("content")
+    if block.get("type") != "tool_result" or not isinstance(content, str) or len(content) <= max_chars:
+        return block
+    digest = hashlib.sha1(content.encode()).hexdigest()[:12]
+    summary = f"{content[:max_chars]}\n... [truncated {len(content) - max_chars} of {len(content)} chars, sha1 {digest}]"
+    return {**block, "content": summary}
 
 
-async def _get_user_approval(rec) -> str | dict:
-    """Interactive approval prompt for a trade recommendation."""
-    from prompt_toolkit import PromptSession
-    session = PromptSession()
+def _block_type(block) -> str | None:
+    """Content blocks are SDK objects from responses or dicts we built."""
+    if isinstance(block, dict):
+        return block.get("type")
+    return getattr(block, "type", None)
+
+
+def _to_json(obj) -> str:
+    """Serialize a tool result/input for Claude, stringifying unknown types."""
+    return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
+def _tool_key(name: str, args: dict) -> tuple:
+    """Canonical identity for a tool call, shared by loop detection and the run cache.
+
+    OPT_SORT_KEYS sorts nested dicts too, so argument key order never matters.
+    """
+    try:
+        return name, orjson.dumps(args, option=orjson.OPT_SORT_KEYS)
+    except orjson.JSONEncodeError:
+        # Valid JSON orjson can't encode, e.g. integers beyond 64 bits
+        return name, json.dumps(args, sort_keys=True, default=str).encode()
+
+
+async def _get_user_approval(rec, session: PromptSession) -> str | dict:
+    """Interactive approval prompt for a trade recommendation."""
     while True:
         try:
             answer = await session.prompt_async(">> ")
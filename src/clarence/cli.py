@@ -1,10 +1,13 @@
 import asyncio
+import sys
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from clarence.agent import Agent
 from clarence.mcp_client import AlpacaMCPClient
+from clarence.model import close_client
+from clarence.tools.finance.api import close_http
 from clarence.risk import get_risk_parameters, RISK_LEVELS
 from clarence.utils.intro import print_intro
 from clarence.utils.profile import ProfileManager
@@ -47,7 +50,7 @@ def run_onboarding(profile_manager: ProfileManager) -> dict:
 
 async def async_main():
     profile_manager = ProfileManager()
-    profile = profile_manager.load_or_create_profile()
+    profile = await asyncio.to_thread(profile_manager.load_or_create_profile)
 
     if not profile.get("name"):
         profile = run_onboarding(profile_manager)
@@ -68,6 +71,7 @@ async def async_main():
     agent = Agent(mcp=mcp, risk_level=profile.get("risk_appetite", "medium"))
 
     session = PromptSession(history=InMemoryHistory())
+    agent.session = session
 
     try:
         while True:
@@ -106,7 +110,7 @@ async def async_main():
                         if choice in ("1", "2", "3"):
                             new_risk = {"1": "low", "2": "medium", "3": "high"}[choice]
                             profile["risk_appetite"] = new_risk
-                            profile_manager.save_profile(profile)
+                            await asyncio.to_thread(profile_manager.save_profile, profile)
                             agent.risk_level = new_risk
                             agent.risk_params = get_risk_parameters(new_risk)
                             print(f"Risk level updated to: {new_risk}\n")
@@ -133,16 +137,30 @@ async def async_main():
             except (KeyboardInterrupt, EOFError):
                 break
     finally:
-        # Update session count
+        # Update session count (single write on exit)
         profile["session_count"] = profile.get("session_count", 0) + 1
-        profile_manager.save_profile(profile)
+        await asyncio.to_thread(profile_manager.save_profile, profile)
 
         await mcp.disconnect()
+        await close_client()
+        await close_http()
         print(f"\nGoodbye, {profile.get('name', 'trader')}!\n")
 
 
 def main():
-    asyncio.run(async_main())
+    # uvloop is optional (pip install clarence[fast]); fall back to the stdlib loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(async_main())
+        return
+
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(async_main())
+    else:
+        uvloop.install()
+        asyncio.run(async_main())
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 import os
-import json
+
+import orjson
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
@@ -11,6 +12,7 @@ class AlpacaMCPClient:
         self.session: ClientSession | None = None
         self._client_cm = None
         self._session_cm = None
+        self._tools_cache: list[dict] = []
 
     async def connect(self):
         """Spawn the alpaca-mcp-server subprocess and establish a session."""
@@ -42,9 +44,22 @@ class AlpacaMCPClient:
         self._session_cm = ClientSession(read_stream, write_stream)
         self.session = await self._session_cm.__aenter__()
         await self.session.initialize()
+        self._tools_cache = await self._build_tools()
 
     async def get_tools(self) -> list[dict]:
-        """Return tool definitions formatted for the Anthropic API."""
+        """Return tool definitions formatted for the Anthropic API.
+
+        The server's tool list is stable for a session, so this serves the
+        list fetched on connect. Use refresh_tools() to force a reload.
+        """
+        return list(self._tools_cache)
+
+    async def refresh_tools(self) -> list[dict]:
+        """Re-fetch tool definitions from the MCP server."""
+        self._tools_cache = await self._build_tools()
+        return list(self._tools_cache)
+
+    async def _build_tools(self) -> list[dict]:
         if not self.session:
             return []
 
@@ -61,14 +76,14 @@ class AlpacaMCPClient:
     async def call_tool(self, name: str, args: dict) -> str:
         """Execute an MCP tool and return the text result."""
         if not self.session:
-            return json.dumps({"error": "MCP session not connected"})
+            return orjson.dumps({"error": "MCP session not connected"}).decode()
 
         result = await self.session.call_tool(name, args)
         parts = []
         for block in result.content:
             if hasattr(block, "text"):
                 parts.append(block.text)
-        return "\n".join(parts) if parts else json.dumps({"result": "ok"})
+        return "\n".join(parts) if parts else orjson.dumps({"result": "ok"}).decode()
 
     async def disconnect(self):
         """Cleanly shut down the MCP session and subprocess."""
@@ -83,3 +98,4 @@ class AlpacaMCPClient:
             except Exception:
                 pass
         self.session = None
+        self._tools_cache = []
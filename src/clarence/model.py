@@ -1,17 +1,69 @@
+import asyncio
 import os
-import time
+import random
+from types import MappingProxyType
 from typing import AsyncIterator
 
 import anthropic
 
 DEFAULT_MODEL = "claude-sonnet-4-5-20250929"
+DEFAULT_MAX_TOKENS = 4096
+
+# Request fields shared by every call; per-call fields are layered on top
+_BASE_KWARGS = MappingProxyType({"model": DEFAULT_MODEL, "max_tokens": DEFAULT_MAX_TOKENS})
+
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+# Shared across calls so the underlying httpx connection pool stays warm
+_client: anthropic.AsyncAnthropic | None = None
 
 
 def _get_client() -> anthropic.AsyncAnthropic:
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
-    return anthropic.AsyncAnthropic(api_key=api_key)
+    global _client
+    if _client is None:
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
+        _client = anthropic.AsyncAnthropic(api_key=api_key)
+    return _client
+
+
+def _build_kwargs(
+    messages: list[dict],
+    system: str,
+    tools: list[dict] | None,
+    model: str,
+    max_tokens: int,
+    tool_choice: dict | None = None,
+) -> dict:
+    kwargs = {**_BASE_KWARGS, "messages": messages}
+    if model != DEFAULT_MODEL:
+        kwargs["model"] = model
+    if max_tokens != DEFAULT_MAX_TOKENS:
+        kwargs["max_tokens"] = max_tokens
+    # Mark system and tools as cacheable so the server reuses them across
+    # the repeated calls of a tool-use loop. A cache breakpoint on the last
+    # tool covers the whole tools array.
+    if system:
+        kwargs["system"] = [{"type": "text", "text": system, "cache_control": _CACHE_CONTROL}]
+    if tools:
+        kwargs["tools"] = [*tools[:-1], {**tools[-1], "cache_control": _CACHE_CONTROL}]
+    if tool_choice:
+        kwargs["tool_choice"] = tool_choice
+    return kwargs
+
+
+def _backoff(base: float, attempt: int) -> float:
+    """Exponential backoff with jitter so concurrent retries don't collide."""
+    return base * (2 ** attempt) + random.uniform(0, 0.25)
+
+
+async def close_client():
+    """Close the shared Anthropic client and its connection pool."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
 
 
 async def call_llm(
@@ -19,7 +71,7 @@ async def call_llm(
     system: str = "",
     tools: list[dict] | None = None,
     model: str = DEFAULT_MODEL,
-    max_tokens: int = 4096,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
 ) -> anthropic.types.Message:
     """Send a request to Claude and return the full Message response.
 
@@ -27,15 +79,7 @@ async def call_llm(
     response.stop_reason and response.content to decide next steps.
     """
     client = _get_client()
-    kwargs: dict = {
-        "model": model,
-        "max_tokens": max_tokens,
-        "messages": messages,
-    }
-    if system:
-        kwargs["system"] = system
-    if tools:
-        kwargs["tools"] = tools
+    kwargs = _build_kwargs(messages, system, tools, model, max_tokens)
 
     for attempt in range(3):
         try:
@@ -45,28 +89,29 @@ async def call_llm(
         except anthropic.APIConnectionError:
             if attempt == 2:
                 raise
-            time.sleep(0.5 * (2 ** attempt))
+            await asyncio.sleep(_backoff(0.5, attempt))
         except anthropic.RateLimitError:
             if attempt == 2:
                 raise
-            time.sleep(1.0 * (2 ** attempt))
+            await asyncio.sleep(_backoff(1.0, attempt))
 
 
 async def call_llm_stream(
     messages: list[dict],
     system: str = "",
+    tools: list[dict] | None = None,
     model: str = DEFAULT_MODEL,
-    max_tokens: int = 4096,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    tool_choice: dict | None = None,
 ) -> AsyncIterator[str]:
-    """Stream text chunks from Claude. Does not support tool use."""
+    """Stream text chunks from Claude.
+
+    Only text is yielded. Tools may be passed so that a history containing
+    tool_use/tool_result blocks is accepted, but tool calls are not surfaced;
+    pass tool_choice={"type": "none"} to make sure the reply is text.
+    """
     client = _get_client()
-    kwargs: dict = {
-        "model": model,
-        "max_tokens": max_tokens,
-        "messages": messages,
-    }
-    if system:
-        kwargs["system"] = system
+    kwargs = _build_kwargs(messages, system, tools, model, max_tokens, tool_choice)
 
     for attempt in range(3):
         try:
@@ -79,4 +124,47 @@ async def call_llm_stream(
         except (anthropic.APIConnectionError, anthropic.RateLimitError):
             if attempt == 2:
                 raise
-            time.sleep(0.5 * (2 ** attempt))
+            await asyncio.sleep(_backoff(0.5, attempt))
+
+
+class MessageStream:
+    """Text deltas of one Claude turn, with the full Message kept for afterwards.
+
+    Iterate it to receive text as it is generated; once exhausted, `message`
+    holds the final Message (stop_reason, tool_use blocks) as call_llm would
+    have returned it. A failed connection is retried only if no text has been
+    yielded yet, so the caller never sees a chunk twice.
+    """
+
+    def __init__(self, kwargs: dict):
+        self._kwargs = kwargs
+        self.message: anthropic.types.Message | None = None
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        client = _get_client()
+        for attempt in range(3):
+            started = False
+            try:
+                async with client.messages.stream(**self._kwargs) as stream:
+                    async for text in stream.text_stream:
+                        started = True
+                        yield text
+                    self.message = await stream.get_final_message()
+                return
+            except KeyboardInterrupt:
+                raise
+            except (anthropic.APIConnectionError, anthropic.RateLimitError):
+                if started or attempt == 2:
+                    raise
+                await asyncio.sleep(_backoff(0.5, attempt))
+
+
+def stream_llm_message(
+    messages: list[dict],
+    system: str = "",
+    tools: list[dict] | None = None,
+    model: str = DEFAULT_MODEL,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+) -> MessageStream:
+    """Stream a tool-capable Claude turn: text as it arrives, then the Message."""
+    return MessageStream(_build_kwargs(messages, system, tools, model, max_tokens))
@@ -1,5 +1,8 @@
 from dataclasses import dataclass
 from typing import List
+
+import numpy as np
+
 from clarence.schemas import DayTradingScore
 
 
@@ -53,19 +56,31 @@ def get_risk_parameters(level: str) -> RiskParameters:
     return RISK_LEVELS.get(level, RISK_LEVELS["medium"])
 
 
+def filter_by_risk_np(
+    scores_arr: np.ndarray,
+    spreads_arr: np.ndarray,
+    volumes_arr: np.ndarray,
+    params: RiskParameters,
+) -> np.ndarray:
+    """Vectorized risk filter over parallel score/spread/volume arrays.
+
+    Returns a boolean mask of candidates that pass all three thresholds.
+    """
+    return (
+        (scores_arr >= params.min_score)
+        & (spreads_arr <= params.max_spread_pct)
+        & (volumes_arr >= params.min_volume)
+    )
+
+
 def filter_by_risk(scores: List[DayTradingScore], params: RiskParameters) -> List[DayTradingScore]:
     """Filter scored candidates by risk parameters."""
-    filtered = []
-    for s in scores:
-        m = s.metrics
-        if s.total_score < params.min_score:
-            continue
-        if m.spread_percent > params.max_spread_pct:
-            continue
-        if m.volume < params.min_volume:
-            continue
-        filtered.append(s)
-    return filtered
+    n = len(scores)
+    scores_arr = np.fromiter((s.total_score for s in scores), dtype=np.float64, count=n)
+    spreads_arr = np.fromiter((s.metrics.spread_percent for s in scores), dtype=np.float64, count=n)
+    volumes_arr = np.fromiter((s.metrics.volume for s in scores), dtype=np.float64, count=n)
+    mask = filter_by_risk_np(scores_arr, spreads_arr, volumes_arr, params)
+    return [scores[i] for i in np.nonzero(mask)[0]]
 
 
 def calculate_position_size(buying_power: float, params: RiskParameters, price: float) -> int:
@@ -78,6 +93,16 @@ def calculate_position_size(buying_power: float, params: RiskParameters, price:
     return max(shares, 0)
 
 
+def calculate_position_sizes(buying_power: float, params: RiskParameters, prices: np.ndarray) -> np.ndarray:
+    """Vectorized calculate_position_size over an array of prices."""
+    mid_pct = (params.position_size_min_pct + params.position_size_max_pct) / 2
+    dollar_amount = buying_power * (mid_pct / 100)
+    prices = np.asarray(prices, dtype=np.float64)
+    shares = np.zeros(prices.shape, dtype=np.float64)
+    np.divide(dollar_amount, prices, out=shares, where=prices > 0)
+    return np.maximum(shares.astype(np.int64), 0)
+
+
 def calculate_stop_loss(entry_price: float, params: RiskParameters) -> float:
     """Calculate stop loss price based on risk parameters."""
     return round(entry_price * (1 - params.stop_loss_pct / 100), 2)
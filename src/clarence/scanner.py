@@ -1,15 +1,31 @@
+import asyncio
 import json
+import re
+from functools import lru_cache
 from typing import List
 
+import orjson
+
 from clarence.mcp_client import AlpacaMCPClient
 from clarence.model import call_llm, call_llm_stream
 from clarence.prompts import SCANNING_PROMPT, OPPORTUNITY_PROMPT
-from clarence.risk import RiskParameters, filter_by_risk, calculate_position_size, calculate_stop_loss
+from clarence.risk import RISK_LEVELS, RiskParameters, filter_by_risk
 from clarence.schemas import DayTradingMetrics, DayTradingScore, TradeRecommendation
-from clarence.tools import get_most_active_stocks, get_top_movers, get_stock_quote, get_stock_bars_data
-from clarence.utils.scoring import calculate_day_trading_score, format_score_breakdown
+from clarence.tools import get_most_active_stocks, get_top_movers, get_stock_quotes_batch, get_stock_bars_batch
+from clarence.utils.scoring import calculate_day_trading_scores_batch, format_score_breakdown
+from clarence.utils.scoring_fast import bar_metrics, pack_bars
 from clarence.utils.logger import Logger
 
+# Only the best few filtered candidates are worth the LLM's input tokens
+PROMPT_TOP_K = 8
+
+_JSON_DECODER = json.JSONDecoder()
+
+_ROW_FMT = (
+    "{0}: score={1:.0f} | vol_ratio={2:.1f}x | spread={3:.3f}% | "
+    "volatility={4:.1f}% | gap={5:+.1f}% | price=${6:.2f}"
+)
+
 
 class OpportunityScanner:
     """Scans the market for day trading opportunities filtered by risk appetite."""
@@ -19,13 +35,29 @@ class OpportunityScanner:
         self.risk_params = risk_params
         self.logger = logger
 
+        # Risk fields are fixed for this scanner, so format them into the
+        # scanning prompt once and leave only the per-scan fields open.
+        header, _, tail = SCANNING_PROMPT.partition("{scored_candidates}")
+        self._prompt_header = header.format(
+            risk_level=_risk_label(risk_params),
+            buying_power=_Deferred("buying_power"),
+            stop_loss_pct=risk_params.stop_loss_pct,
+            pos_size_min=risk_params.position_size_min_pct,
+            pos_size_max=risk_params.position_size_max_pct,
+            positions_summary=_Deferred("positions_summary"),
+        )
+        self._prompt_tail = tail.format()
+
     async def scan(self) -> List[TradeRecommendation]:
         """Run the full scan pipeline: discover → score → filter → recommend."""
-        # 1. Get account info
-        account_text = await self.mcp.call_tool("get_account_info", {})
+        # 1-2. Get account info and current positions (independent MCP calls)
+        account_text, positions_text = await asyncio.gather(
+            self.mcp.call_tool("get_account_info", {}),
+            self.mcp.call_tool("get_all_positions", {}),
+        )
         try:
-            account = json.loads(account_text)
-        except json.JSONDecodeError:
+            account = orjson.loads(account_text)
+        except orjson.JSONDecodeError:
             # MCP server returns a human-readable formatted string, not JSON —
             # parse "Key: $value" lines into a dict.
             account = _parse_account_text(account_text)
@@ -36,47 +68,40 @@ class OpportunityScanner:
         buying_power = float(account.get("buying_power", 0))
         self.logger._log(f"Buying power: ${buying_power:,.2f}")
 
-        # 2. Get current positions
-        positions_text = await self.mcp.call_tool("get_all_positions", {})
         try:
-            positions = json.loads(positions_text)
-        except json.JSONDecodeError:
+            positions = orjson.loads(positions_text)
+        except orjson.JSONDecodeError:
             positions = []
 
         held_symbols = set()
         positions_summary = "None"
         if positions and isinstance(positions, list):
-            held_symbols = {p.get("symbol", "") for p in positions}
             lines = []
             for p in positions:
-                sym = p.get("symbol", "?")
+                sym = p.get("symbol", "")
                 qty = p.get("qty", 0)
                 pnl = p.get("unrealized_pl", 0)
-                lines.append(f"  {sym}: {qty} shares (P&L: ${float(pnl):+,.2f})")
+                held_symbols.add(sym)
+                lines.append(f"  {sym or '?'}: {qty} shares (P&L: ${float(pnl):+,.2f})")
             positions_summary = "\n".join(lines) if lines else "None"
 
         # 3. Get candidate symbols from screener
-        with self.logger.progress("Scanning market for opportunities..."):
-            actives = get_most_active_stocks(top=20)
-            movers = get_top_movers(top=20)
-
-        # Surface any screener errors before filtering
-        for item in actives:
-            if "error" in item:
-                self.logger._log(f"  ! Screener (actives) error: {item['error']}")
-        for item in movers:
-            if "error" in item:
-                self.logger._log(f"  ! Screener (movers) error: {item['error']}")
+        async with self.logger.async_progress("Scanning market for opportunities..."):
+            actives, movers = await asyncio.gather(
+                asyncio.to_thread(get_most_active_stocks, top=20),
+                asyncio.to_thread(get_top_movers, top=20),
+            )
 
+        # One pass over both screeners: surface errors, collect tradable symbols
         candidates = set()
-        for item in actives:
-            sym = item.get("symbol", "")
-            if sym and "error" not in item and not _is_warrant_or_unit(sym):
-                candidates.add(sym)
-        for item in movers:
-            sym = item.get("symbol", "")
-            if sym and "error" not in item and not _is_warrant_or_unit(sym):
-                candidates.add(sym)
+        for source, items in (("actives", actives), ("movers", movers)):
+            for item in items:
+                if "error" in item:
+                    self.logger._log(f"  ! Screener ({source}) error: {item['error']}")
+                    continue
+                sym = item.get("symbol", "")
+                if sym and not _is_warrant_or_unit(sym):
+                    candidates.add(sym)
 
         candidates -= held_symbols
         self.logger._log(f"Found {len(candidates)} candidate symbols")
@@ -85,14 +110,17 @@ class OpportunityScanner:
             self.logger._log("No candidates found.")
             return []
 
-        # 4. Fetch metrics and score candidates via MCP
-        scores: List[DayTradingScore] = []
-        with self.logger.progress("Scoring candidates..."):
-            for symbol in list(candidates)[:15]:  # Cap to avoid too many API calls
-                metrics = await self._fetch_metrics(symbol)
-                if metrics:
-                    s = calculate_day_trading_score(metrics)
-                    scores.append(s)
+        # 4. Fetch quotes and bars for all candidates (two concurrent batched requests), then score
+        symbols = list(candidates)[:15]  # Cap to keep the batch requests small
+        async with self.logger.async_progress("Scoring candidates..."):
+            quotes, bars = await asyncio.gather(
+                asyncio.to_thread(get_stock_quotes_batch, symbols),
+                asyncio.to_thread(get_stock_bars_batch, symbols, limit=5),
+            )
+            # Only survivors of the risk filter (score >= min_score) reach the LLM prompt
+            scores = calculate_day_trading_scores_batch(
+                self._build_metrics(symbols, quotes, bars), explain_min_score=self.risk_params.min_score
+            )
 
         scores.sort(key=lambda s: s.total_score, reverse=True)
 
@@ -130,28 +158,16 @@ class OpportunityScanner:
                 self.logger._log("No candidates passed risk filters.")
             return []
 
-        # 6. Generate recommendations via LLM
-        scored_text = "\n".join([
-            f"{s.symbol}: score={s.total_score:.0f} | "
-            f"vol_ratio={s.metrics.volume_ratio:.1f}x | "
-            f"spread={s.metrics.spread_percent:.3f}% | "
-            f"volatility={s.metrics.volatility:.1f}% | "
-            f"gap={s.metrics.gap_percent:+.1f}% | "
-            f"price=${s.metrics.current_price:.2f}"
-            for s in filtered[:8]
-        ])
-
-        prompt = SCANNING_PROMPT.format(
-            risk_level=_risk_label(self.risk_params),
-            buying_power=buying_power,
-            stop_loss_pct=self.risk_params.stop_loss_pct,
-            pos_size_min=self.risk_params.position_size_min_pct,
-            pos_size_max=self.risk_params.position_size_max_pct,
-            positions_summary=positions_summary,
-            scored_candidates=scored_text,
+        # 6. Generate recommendations via LLM (filtered is already sorted by score)
+        scored_text = "\n".join(map(_format_candidate, filtered[:PROMPT_TOP_K]))
+
+        prompt = (
+            self._prompt_header.format(buying_power=buying_power, positions_summary=positions_summary)
+            + scored_text
+            + self._prompt_tail
         )
 
-        with self.logger.progress("Generating recommendations..."):
+        async with self.logger.async_progress("Generating recommendations..."):
             response = await call_llm(
                 messages=[{"role": "user", "content": prompt}],
                 system="You are a trading analysis engine. Return only valid JSON.",
@@ -191,77 +207,86 @@ class OpportunityScanner:
         result_text = await self.mcp.call_tool("place_stock_order", args)
         return result_text
 
-    async def _fetch_metrics(self, symbol: str) -> DayTradingMetrics | None:
-        """Fetch quote and bars via alpaca-py, build DayTradingMetrics."""
-        try:
-            quote = get_stock_quote(symbol)
+    def _build_metrics(
+        self,
+        symbols: List[str],
+        quotes: dict[str, dict],
+        bars: dict[str, dict],
+    ) -> List[DayTradingMetrics]:
+        """Build DayTradingMetrics from prefetched quotes and daily bars.
+
+        Symbols with a quote or bars error are reported and skipped; the bar
+        arithmetic for the rest runs in one batched kernel call.
+        """
+        valid = []
+        for symbol in symbols:
+            quote = quotes.get(symbol, {})
+            bar_data = bars.get(symbol, {})
             if "error" in quote:
                 self.logger._log(f"  ! {symbol}: quote error: {quote['error']}")
-                return None
+                continue
+            if "error" in bar_data:
+                self.logger._log(f"  ! {symbol}: bars error: {bar_data['error']}")
+                continue
+            valid.append(symbol)
+
+        if not valid:
+            return []
+
+        try:
+            volume, avg_volume, vol_ratio, volatility, gap_pct = bar_metrics(
+                *pack_bars([bars.get(symbol, {}) for symbol in valid])
+            )
+        except Exception as e:
+            self.logger._log(f"  ! metrics build failed ({type(e).__name__}: {e})")
+            return []
 
+        # tolist() converts each column to Python ints/floats in one C pass,
+        # so the dataclass receives native values without per-field casts
+        rows = zip(
+            valid, volume.tolist(), avg_volume.tolist(), vol_ratio.tolist(), volatility.tolist(), gap_pct.tolist()
+        )
+        metrics = []
+        for symbol, vol, avg_vol, ratio, vty, gap in rows:
+            quote = quotes.get(symbol, {})
             bid = float(quote.get("bid_price", 0))
             ask = float(quote.get("ask_price", 0))
             mid = (bid + ask) / 2 if (bid and ask) else 0
             spread = ask - bid if (bid and ask) else 0
             spread_pct = (spread / mid * 100) if mid else 0
 
-            bar_list = get_stock_bars_data(symbol, limit=5)
-            if bar_list and "error" in bar_list[0]:
-                self.logger._log(f"  ! {symbol}: bars error: {bar_list[0]['error']}")
-                return None
-
-            volume = 0
-            avg_volume = 0
-            volatility = 0.0
-            gap_pct = 0.0
-
-            if bar_list:
-                latest = bar_list[-1]
-                volume = int(latest.get("volume", 0))
-                open_price = float(latest.get("open", mid))
-                high = float(latest.get("high", mid))
-                low = float(latest.get("low", mid))
-
-                if open_price > 0:
-                    volatility = (high - low) / open_price * 100
-
-                if len(bar_list) > 1:
-                    volumes = [int(b.get("volume", 0)) for b in bar_list[:-1]]
-                    avg_volume = sum(volumes) // len(volumes) if volumes else volume
-                    prev_close = float(bar_list[-2].get("close", mid))
-                    if prev_close > 0:
-                        gap_pct = (open_price - prev_close) / prev_close * 100
-
-            vol_ratio = volume / avg_volume if avg_volume > 0 else 1.0
-
-            return DayTradingMetrics(
+            metrics.append(DayTradingMetrics(
                 symbol=symbol,
                 current_price=mid,
                 bid_price=bid,
                 ask_price=ask,
                 spread=spread,
                 spread_percent=spread_pct,
-                volume=volume,
-                avg_volume=avg_volume,
-                volume_ratio=vol_ratio,
-                volatility=volatility,
-                gap_percent=gap_pct,
-            )
-        except Exception as e:
-            self.logger._log(f"  ! {symbol}: metrics fetch failed ({type(e).__name__}: {e})")
-            return None
+                volume=vol,
+                avg_volume=avg_vol,
+                volume_ratio=ratio,
+                volatility=vty,
+                gap_percent=gap,
+            ))
+        return metrics
 
     def _parse_recommendations(self, text: str, scores: List[DayTradingScore]) -> List[TradeRecommendation]:
         """Parse LLM JSON response into TradeRecommendation objects."""
         score_map = {s.symbol: s for s in scores}
         try:
-            # Extract JSON from response
-            start = text.find("{")
-            end = text.rfind("}") + 1
-            if start < 0 or end <= 0:
-                self.logger._log(f"! LLM returned no JSON. Raw response:\n{text[:500]}")
-                return []
-            data = json.loads(text[start:end])
+            # The prompt asks for a bare JSON object, so try that first; otherwise
+            # decode the first object in the response and ignore any surrounding
+            # prose (or a bare list/string that parsed but isn't an object)
+            try:
+                data = orjson.loads(text.strip())
+            except orjson.JSONDecodeError:
+                data = None
+            if not isinstance(data, dict):
+                start = text.find("{")
+                if start < 0:
+                    self.logger._log(f"! LLM returned no JSON object. Raw response:\n{text[:500]}")
+                    return []
+                data, _ = _JSON_DECODER.raw_decode(text, start)
             recs = []
             for r in data.get("recommendations", []):
                 symbol = r.get("symbol", "")
@@ -280,7 +305,7 @@ class OpportunityScanner:
                     score=score,
                 ))
             return recs
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
+        except (orjson.JSONDecodeError, KeyError, ValueError, TypeError, AttributeError) as e:
             self.logger._log(f"! Failed to parse LLM recommendations ({type(e).__name__}): {e}")
             self.logger._log(f"  Raw LLM response:\n{text[:500]}")
             return []
@@ -292,34 +317,52 @@ def _parse_account_text(text: str) -> dict:
     Converts lines like "Buying Power: $499.75" into {"buying_power": "499.75"}.
     """
     result = {}
-    for line in text.splitlines():
-        line = line.strip()
-        if ":" not in line or line.startswith("-"):
-            continue
-        key, _, value = line.partition(":")
-        key = key.strip().lower().replace(" ", "_")
-        value = value.strip().lstrip("$").replace(",", "")
-        if key and value:
+    for m in _ACCOUNT_LINE_RE.finditer(text):
+        key = m.group(1).lower().replace(" ", "_")
+        value = m.group(2).translate(_NO_COMMAS)
+        if value:
             result[key] = value
     return result
 
 
+# "Key: value" lines, skipping "---" separators; "$" and commas are stripped from values
+_ACCOUNT_LINE_RE = re.compile(r"^[^\S\n]*([^\s:-][^:\n]*?)[^\S\n]*:[^\S\n]*\$*(.*?)[^\S\n]*$", re.MULTILINE)
+_NO_COMMAS = str.maketrans("", "", ",")
+
+
+class _Deferred:
+    """Format placeholder that re-emits itself, spec included, for a later .format()."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __format__(self, spec: str) -> str:
+        return f"{{{self.name}:{spec}}}" if spec else f"{{{self.name}}}"
+
+
+_WARRANT_UNIT_SUFFIXES = frozenset("WUR")
+
+
+@lru_cache(maxsize=None)
 def _is_warrant_or_unit(symbol: str) -> bool:
     """Filter out warrants, units, and rights.
 
     SPAC warrants/units are 5+ chars ending in W, U, or R (e.g. ACAMW, IPAXU).
     Four-char tickers ending in those letters are regular stocks (e.g. CRWD, UBER).
     """
-    if "+" in symbol:
-        return True
-    if len(symbol) >= 5 and symbol[-1] in ("W", "U", "R"):
-        return True
-    return False
+    return "+" in symbol or (len(symbol) >= 5 and symbol[-1] in _WARRANT_UNIT_SUFFIXES)
+
+
+def _format_candidate(s: DayTradingScore) -> str:
+    m = s.metrics
+    return _ROW_FMT.format(
+        s.symbol, s.total_score, m.volume_ratio, m.spread_percent, m.volatility, m.gap_percent, m.current_price
+    )
+
+
+# RISK_LEVELS entries are module-level singletons, so identity maps them back to their name
+_LABEL_BY_ID = {id(p): name for name, p in RISK_LEVELS.items()}
 
 
 def _risk_label(params: RiskParameters) -> str:
-    from clarence.risk import RISK_LEVELS
-    for name, p in RISK_LEVELS.items():
-        if p is params:
-            return name
-    return "medium"
+    return _LABEL_BY_ID.get(id(params), "medium")
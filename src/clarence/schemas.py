@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from pydantic import BaseModel, Field
 from typing import List, Optional
 
@@ -21,7 +22,11 @@ class UserProfile(BaseModel):
     session_count: int = 0
 
 
-class DayTradingMetrics(BaseModel):
+# Internal per-symbol scoring carriers are plain slotted dataclasses: they are
+# built from locally computed numbers, so Pydantic validation buys nothing.
+# Pydantic still validates/serializes them when nested in TradeRecommendation.
+@dataclass(slots=True)
+class DayTradingMetrics:
     symbol: str
     current_price: float
     bid_price: float
@@ -35,7 +40,8 @@ class DayTradingMetrics(BaseModel):
     gap_percent: float = 0.0
 
 
-class DayTradingScore(BaseModel):
+@dataclass(slots=True)
+class DayTradingScore:
     symbol: str
     total_score: float
     liquidity_score: float
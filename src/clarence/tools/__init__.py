@@ -1,15 +1,28 @@
 """Local tools that are NOT exposed to the LLM but used by the scanner."""
 
 import os
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
 from alpaca.data.enums import MostActivesBy
 from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.historical.screener import ScreenerClient
+from alpaca.data.requests import (
+    MarketMoversRequest,
+    MostActivesRequest,
+    StockBarsRequest,
+    StockLatestQuoteRequest,
+)
 from alpaca.data.timeframe import TimeFrame
 
 from clarence.tools.finance.news import get_news
 from clarence.tools.finance.metrics import get_financial_metrics_snapshot, get_financial_metrics
 
 
+# Clients are cached so every call reuses the same requests.Session and its
+# keep-alive connections instead of paying a new TLS handshake per request.
+@lru_cache(maxsize=1)
 def _get_screener_client() -> ScreenerClient:
     return ScreenerClient(
         api_key=os.getenv("ALPACA_API_KEY", ""),
@@ -17,6 +30,7 @@ def _get_screener_client() -> ScreenerClient:
     )
 
 
+@lru_cache(maxsize=1)
 def _get_data_client() -> StockHistoricalDataClient:
     return StockHistoricalDataClient(
         api_key=os.getenv("ALPACA_API_KEY", ""),
@@ -27,7 +41,6 @@ def _get_data_client() -> StockHistoricalDataClient:
 def get_stock_quote(symbol: str) -> dict:
     """Fetch latest bid/ask quote for a symbol via alpaca-py."""
     try:
-        from alpaca.data.requests import StockLatestQuoteRequest
         client = _get_data_client()
         result = client.get_stock_latest_quote(StockLatestQuoteRequest(symbol_or_symbols=symbol))
         quote = result.get(symbol)
@@ -41,35 +54,80 @@ def get_stock_quote(symbol: str) -> dict:
         return {"error": str(e)}
 
 
-def get_stock_bars_data(symbol: str, limit: int = 5) -> list[dict]:
-    """Fetch recent daily bars for a symbol via alpaca-py."""
+def _bars_to_columns(bars) -> dict[str, np.ndarray]:
+    """Unpack alpaca Bar objects into float64 OHLCV columns (oldest first)."""
+    return {
+        "open": np.fromiter((b.open for b in bars), dtype=np.float64, count=len(bars)),
+        "high": np.fromiter((b.high for b in bars), dtype=np.float64, count=len(bars)),
+        "low": np.fromiter((b.low for b in bars), dtype=np.float64, count=len(bars)),
+        "close": np.fromiter((b.close for b in bars), dtype=np.float64, count=len(bars)),
+        "volume": np.fromiter((b.volume for b in bars), dtype=np.float64, count=len(bars)),
+    }
+
+
+def get_stock_bars_data(symbol: str, limit: int = 5) -> dict:
+    """Fetch recent daily bars for a symbol via alpaca-py.
+
+    Returns {"open", "high", "low", "close", "volume"} NumPy columns, or
+    {"error": ...} on failure.
+    """
     try:
-        from alpaca.data.requests import StockBarsRequest
         client = _get_data_client()
         result = client.get_stock_bars(StockBarsRequest(
             symbol_or_symbols=symbol,
             timeframe=TimeFrame.Day,
             limit=limit,
         ))
-        bars = result.data.get(symbol, [])
-        return [
-            {
-                "open": float(b.open),
-                "high": float(b.high),
-                "low": float(b.low),
-                "close": float(b.close),
-                "volume": int(b.volume),
+        return _bars_to_columns(result.data.get(symbol, []))
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def get_stock_quotes_batch(symbols: list[str]) -> dict[str, dict]:
+    """Fetch latest bid/ask quotes for many symbols in one request.
+
+    Symbols with no quote are absent from the result. On failure, every
+    symbol maps to {"error": ...} so callers can report it per symbol.
+    """
+    try:
+        client = _get_data_client()
+        result = client.get_stock_latest_quote(StockLatestQuoteRequest(symbol_or_symbols=symbols))
+        return {
+            symbol: {
+                "bid_price": float(quote.bid_price or 0),
+                "ask_price": float(quote.ask_price or 0),
             }
-            for b in bars
-        ]
+            for symbol, quote in result.items()
+            if quote
+        }
     except Exception as e:
-        return [{"error": str(e)}]
+        return {symbol: {"error": str(e)} for symbol in symbols}
+
+
+def get_stock_bars_batch(symbols: list[str], limit: int = 5) -> dict[str, dict]:
+    """Fetch the last `limit` daily bars for many symbols in one request.
+
+    Alpaca applies `limit` to the total across all symbols, so this asks
+    for a calendar window wide enough to cover `limit` trading days and
+    trims each symbol's bars locally. Each symbol maps to NumPy OHLCV
+    columns as in get_stock_bars_data; on failure, every symbol maps to
+    {"error": ...}.
+    """
+    try:
+        client = _get_data_client()
+        result = client.get_stock_bars(StockBarsRequest(
+            symbol_or_symbols=symbols,
+            timeframe=TimeFrame.Day,
+            start=datetime.now() - timedelta(days=limit * 2 + 4),
+        ))
+        return {symbol: _bars_to_columns(bars[-limit:]) for symbol, bars in result.data.items()}
+    except Exception as e:
+        return {symbol: {"error": str(e)} for symbol in symbols}
 
 
 def get_most_active_stocks(top: int = 20) -> list[dict]:
     """Use Alpaca screener to find most active stocks by volume."""
     try:
-        from alpaca.data.requests import MostActivesRequest
         client = _get_screener_client()
         request = MostActivesRequest(top=top, by=MostActivesBy.VOLUME)
         result = client.get_most_actives(request)
@@ -88,7 +146,6 @@ def get_most_active_stocks(top: int = 20) -> list[dict]:
 def get_top_movers(top: int = 20, market_type: str = "stocks") -> list[dict]:
     """Use Alpaca screener to find top market movers."""
     try:
-        from alpaca.data.requests import MarketMoversRequest
         client = _get_screener_client()
         request = MarketMoversRequest(top=top, market_type=market_type)
         result = client.get_market_movers(request)
@@ -0,0 +1,95 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import time
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable
+
+####################################
+# Cache Configuration
+####################################
+
+# Lives alongside the user profile in the .clarence directory
+CACHE_DIR = ".clarence/cache"
+
+_MISS = object()
+
+
+class FileCache:
+    """JSON-file TTL cache keyed by endpoint and request params."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, endpoint: str, params: dict) -> Path:
+        key = hashlib.md5(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return self.cache_dir / endpoint / f"{key}.json"
+
+    def get(self, endpoint: str, params: dict) -> Any:
+        """Return cached data, or _MISS if absent, expired, or unreadable."""
+        path = self._path(endpoint, params)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return _MISS
+        if time.time() - entry.get("ts", 0) > entry.get("ttl", 0):
+            return _MISS
+        return entry.get("data")
+
+    def set(self, endpoint: str, params: dict, data: Any, ttl: float):
+        path = self._path(endpoint, params)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w") as f:
+                json.dump({"ts": time.time(), "ttl": ttl, "data": data}, f, default=str)
+        except OSError:
+            # Caching is best-effort; never fail the tool call over it
+            pass
+
+
+_cache = FileCache()
+
+
+def cached(endpoint: str, ttl: float) -> Callable:
+    """Cache a finance function's result on disk for `ttl` seconds.
+
+    The key is the function's bound arguments (defaults applied), so
+    get_news("AAPL") and get_news(ticker="AAPL", limit=5) share an entry.
+    Works on both sync and async functions; sync/async twins that use the
+    same endpoint name share cache entries. The async wrapper does its file
+    I/O in a worker thread so concurrent lookups don't block the event loop.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        def _params(args, kwargs) -> dict:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return dict(bound.arguments)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                params = _params(args, kwargs)
+                data = await asyncio.to_thread(_cache.get, endpoint, params)
+                if data is not _MISS:
+                    return data
+                data = await func(*args, **kwargs)
+                await asyncio.to_thread(_cache.set, endpoint, params, data, ttl)
+                return data
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            params = _params(args, kwargs)
+            data = _cache.get(endpoint, params)
+            if data is not _MISS:
+                return data
+            data = func(*args, **kwargs)
+            _cache.set(endpoint, params, data, ttl)
+            return data
+        return wrapper
+    return decorator
@@ -1,4 +1,6 @@
 import os
+
+import httpx
 import requests
 
 ####################################
@@ -17,3 +19,36 @@ def call_api(endpoint: str, params: dict) -> dict:
     response.raise_for_status()
     return response.json()
 
+
+# Shared async client so concurrent tool calls reuse pooled keep-alive connections.
+# Agent steps are separated by LLM calls that often outlast httpx's default 5s
+# keep-alive expiry, so idle connections are held long enough to survive them.
+_HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30)
+_http: httpx.AsyncClient | None = None
+
+
+def _get_http() -> httpx.AsyncClient:
+    global _http
+    if _http is None:
+        _http = httpx.AsyncClient(
+            base_url="https://api.financialdatasets.ai",
+            limits=_HTTP_LIMITS,
+            timeout=10,
+        )
+    return _http
+
+
+async def acall_api(endpoint: str, params: dict) -> dict:
+    """Async counterpart of call_api backed by a pooled httpx client."""
+    headers = {"x-api-key": financial_datasets_api_key}
+    response = await _get_http().get(endpoint, params=params, headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+
+async def close_http():
+    """Close the shared async HTTP client."""
+    global _http
+    if _http is not None:
+        await _http.aclose()
+        _http = None
@@ -1,7 +1,16 @@
 from typing import Optional
-from clarence.tools.finance.api import call_api
+from clarence.tools.finance.api import call_api, acall_api
+from clarence.tools.finance._cache import cached
 
 
+def _metrics_params(ticker: str, period: str, limit: int, report_period: Optional[str]) -> dict:
+    params = {"ticker": ticker, "period": period, "limit": limit}
+    if report_period:
+        params["report_period"] = report_period
+    return params
+
+
+@cached(endpoint="metrics_snapshot", ttl=15 * 60)
 def get_financial_metrics_snapshot(ticker: str) -> dict:
     """Fetch a snapshot of current financial metrics for a company."""
     params = {"ticker": ticker}
@@ -9,6 +18,15 @@ def get_financial_metrics_snapshot(ticker: str) -> dict:
     return data.get("snapshot", {})
 
 
+@cached(endpoint="metrics_snapshot", ttl=15 * 60)
+async def aget_financial_metrics_snapshot(ticker: str) -> dict:
+    """Async version of get_financial_metrics_snapshot."""
+    params = {"ticker": ticker}
+    data = await acall_api("/financial-metrics/snapshot/", params)
+    return data.get("snapshot", {})
+
+
+@cached(endpoint="metrics", ttl=7 * 24 * 60 * 60)
 def get_financial_metrics(
     ticker: str,
     period: str = "ttm",
@@ -16,8 +34,17 @@ def get_financial_metrics(
     report_period: Optional[str] = None,
 ) -> list:
     """Retrieve historical financial metrics for a company."""
-    params = {"ticker": ticker, "period": period, "limit": limit}
-    if report_period:
-        params["report_period"] = report_period
-    data = call_api("/financial-metrics/", params)
+    data = call_api("/financial-metrics/", _metrics_params(ticker, period, limit, report_period))
+    return data.get("financial_metrics", [])
+
+
+@cached(endpoint="metrics", ttl=7 * 24 * 60 * 60)
+async def aget_financial_metrics(
+    ticker: str,
+    period: str = "ttm",
+    limit: int = 4,
+    report_period: Optional[str] = None,
+) -> list:
+    """Async version of get_financial_metrics."""
+    data = await acall_api("/financial-metrics/", _metrics_params(ticker, period, limit, report_period))
     return data.get("financial_metrics", [])
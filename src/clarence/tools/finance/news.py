@@ -1,7 +1,18 @@
 from typing import Optional
-from clarence.tools.finance.api import call_api
+from clarence.tools.finance.api import call_api, acall_api
+from clarence.tools.finance._cache import cached
 
 
+def _news_params(ticker: str, start_date: Optional[str], end_date: Optional[str], limit: int) -> dict:
+    params = {"ticker": ticker, "limit": limit}
+    if start_date:
+        params["start_date"] = start_date
+    if end_date:
+        params["end_date"] = end_date
+    return params
+
+
+@cached(endpoint="news", ttl=60 * 60)
 def get_news(
     ticker: str,
     start_date: Optional[str] = None,
@@ -9,10 +20,17 @@ def get_news(
     limit: int = 5,
 ) -> list:
     """Retrieve recent news articles for a ticker."""
-    params = {"ticker": ticker, "limit": limit}
-    if start_date:
-        params["start_date"] = start_date
-    if end_date:
-        params["end_date"] = end_date
-    data = call_api("/news/", params)
+    data = call_api("/news/", _news_params(ticker, start_date, end_date, limit))
+    return data.get("news", [])
+
+
+@cached(endpoint="news", ttl=60 * 60)
+async def aget_news(
+    ticker: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    limit: int = 5,
+) -> list:
+    """Async version of get_news."""
+    data = await acall_api("/news/", _news_params(ticker, start_date, end_date, limit))
     return data.get("news", [])
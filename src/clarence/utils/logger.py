@@ -41,3 +41,7 @@ class Logger:
     def progress(self, message: str, success_message: str = ""):
         """Return a progress context manager for showing loading states."""
         return self.ui.progress(message, success_message)
+
+    def async_progress(self, message: str, success_message: str = ""):
+        """Return an async progress context manager driven by the event loop."""
+        return self.ui.async_progress(message, success_message)
@@ -1,9 +1,10 @@
-import json
 import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+import orjson
+
 
 class ProfileManager:
     """Manages user profiles for personalized trading."""
@@ -15,23 +16,22 @@ class ProfileManager:
 
     def load_or_create_profile(self) -> dict:
         if self.profile_path.exists():
-            with open(self.profile_path, "r") as f:
-                profile = json.load(f)
+            profile = orjson.loads(self.profile_path.read_bytes())
             print(f"\nWelcome back, {profile.get('name', 'trader')}!\n")
             return profile
         return self._create_default_profile()
 
     def _create_default_profile(self) -> dict:
+        now = datetime.now().isoformat()
         return {
             "user_id": str(uuid.uuid4()),
             "name": None,
             "risk_appetite": "medium",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
+            "created_at": now,
+            "updated_at": now,
             "session_count": 0,
         }
 
     def save_profile(self, profile: dict):
         profile["updated_at"] = datetime.now().isoformat()
-        with open(self.profile_path, "w") as f:
-            json.dump(profile, f, indent=2)
+        self.profile_path.write_bytes(orjson.dumps(profile, option=orjson.OPT_INDENT_2))
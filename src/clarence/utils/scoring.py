@@ -10,11 +10,136 @@ This module evaluates stocks for day trading suitability based on four key facto
 Each factor is scored 0-25, for a total possible score of 0-100.
 """
 
-from typing import Tuple
+from bisect import bisect_right
+from functools import lru_cache
+from math import copysign, inf, nextafter
+from operator import attrgetter
+from typing import List, Optional, Tuple
+
+import numpy as np
+
 from clarence.schemas import DayTradingMetrics, DayTradingScore
+from clarence.utils.scoring_fast import score_buckets
+
+####################################
+# Score Buckets
+####################################
+
+# Each factor maps its input onto one sorted axis: bisect_right(THRESHOLDS, x)
+# is the index of the (score, explanation template) bucket. A boundary that
+# belongs to the lower bucket (e.g. "2-4%" includes 4.0) is nudged to the next
+# float up so the same bisect handles inclusive and exclusive edges.
+
+
+def _above(x: float) -> float:
+    return nextafter(x, inf)
+
+
+_LIQUIDITY_THRESHOLDS = (0.5, 1.0, 1.5, _above(2.0))
+_LIQUIDITY_BUCKETS = (
+    (5.0, "Low volume ({:.1f}x average) - may be harder to enter/exit"),
+    (10.0, "Moderate volume ({:.1f}x average) - below average interest"),
+    (15.0, "Good volume ({:.1f}x average) - normal trading activity"),
+    (20.0, "Excellent volume ({:.1f}x average) - above normal trading"),
+    (25.0, "Exceptional volume ({:.1f}x average) - high interest today"),
+)
+
+_SPREAD_THRESHOLDS = (0.05, 0.10, 0.20, 0.50)
+_SPREAD_BUCKETS = (
+    (25.0, "Excellent spread ({:.3f}%) - minimal slippage"),
+    (20.0, "Good spread ({:.3f}%) - acceptable for day trading"),
+    (15.0, "Moderate spread ({:.3f}%) - watch entry/exit carefully"),
+    (10.0, "Wide spread ({:.3f}%) - significant slippage risk"),
+    (5.0, "Very wide spread ({:.3f}%) - high cost to trade"),
+)
+
+_VOLATILITY_THRESHOLDS = (0.5, 1.0, 2.0, _above(4.0), _above(6.0), _above(8.0))
+_VOLATILITY_BUCKETS = (
+    (10.0, "Low volatility ({:.1f}%) - limited profit potential"),
+    (15.0, "Moderate volatility ({:.1f}%) - proceed with caution"),
+    (20.0, "Good volatility ({:.1f}%) - workable for day trading"),
+    (25.0, "Ideal volatility ({:.1f}%) - good movement for day trading"),
+    (20.0, "Good volatility ({:.1f}%) - workable for day trading"),
+    (15.0, "Moderate volatility ({:.1f}%) - proceed with caution"),
+    (5.0, "High volatility ({:.1f}%) - elevated risk"),
+)
+
+# Bucketed on abs(gap); templates take (gap_percent, direction)
+_DIRECTION = ("down", "up")  # indexed by gap_percent >= 0
+_MOMENTUM_THRESHOLDS = (0.5, 1.0, _above(3.0), _above(5.0))
+_MOMENTUM_BUCKETS = (
+    (15.0, "Small gap ({0:+.1f}%) - no clear catalyst today"),
+    (20.0, "Good gap ({0:+.1f}% {1}) - momentum present"),
+    (25.0, "Ideal gap ({0:+.1f}% {1}) - clear catalyst, not overdone"),
+    (20.0, "Good gap ({0:+.1f}% {1}) - momentum present"),
+    (10.0, "Large gap ({0:+.1f}% {1}) - may be extended, watch for reversal"),
+)
+
+# Edge arrays and point lookup tables for the batch scorer, indexed like the bucket tuples
+_BUCKET_EDGES = tuple(
+    np.array(thresholds)
+    for thresholds in (_LIQUIDITY_THRESHOLDS, _SPREAD_THRESHOLDS, _VOLATILITY_THRESHOLDS, _MOMENTUM_THRESHOLDS)
+)
+_LIQUIDITY_POINTS = np.array([points for points, _ in _LIQUIDITY_BUCKETS])
+_SPREAD_POINTS = np.array([points for points, _ in _SPREAD_BUCKETS])
+_VOLATILITY_POINTS = np.array([points for points, _ in _VOLATILITY_BUCKETS])
+_MOMENTUM_POINTS = np.array([points for points, _ in _MOMENTUM_BUCKETS])
+
+
+# Explanations depend only on the bucket and the value at display precision,
+# so repeated scans of the same symbols reuse the formatted strings. Values
+# are rounded to the template's precision (which formats identically) before
+# they become cache keys. The sign bit is part of every key because
+# 0.0 == -0.0 would otherwise share an entry and print whichever sign was
+# cached first.
+
+
+def _negative(x: float) -> bool:
+    return copysign(1.0, x) < 0
+
+
+def _liquidity_explanation(idx: int, ratio: float) -> str:
+    rounded = round(ratio, 1)
+    return _liquidity_text(idx, rounded, _negative(rounded))
+
+
+@lru_cache(maxsize=256)
+def _liquidity_text(idx: int, ratio: float, negative: bool) -> str:
+    return _LIQUIDITY_BUCKETS[idx][1].format(ratio)
+
+
+def _spread_explanation(idx: int, spread_percent: float) -> str:
+    rounded = round(spread_percent, 3)
+    return _spread_text(idx, rounded, _negative(rounded))
+
+
+@lru_cache(maxsize=256)
+def _spread_text(idx: int, spread_percent: float, negative: bool) -> str:
+    return _SPREAD_BUCKETS[idx][1].format(spread_percent)
+
+
+def _volatility_explanation(idx: int, volatility_percent: float) -> str:
+    rounded = round(volatility_percent, 1)
+    return _volatility_text(idx, rounded, _negative(rounded))
+
+
+@lru_cache(maxsize=256)
+def _volatility_text(idx: int, volatility_percent: float, negative: bool) -> str:
+    return _VOLATILITY_BUCKETS[idx][1].format(volatility_percent)
 
 
-def calculate_liquidity_score(volume: int, avg_volume: int) -> Tuple[float, str]:
+def _momentum_explanation(idx: int, gap_percent: float) -> str:
+    # Direction comes from the unrounded gap (rounding can turn -0.04 into -0.0)
+    rounded = round(gap_percent, 1)
+    return _momentum_text(idx, rounded, _DIRECTION[gap_percent >= 0], _negative(rounded))
+
+
+@lru_cache(maxsize=256)
+def _momentum_text(idx: int, gap_percent: float, direction: str, negative: bool) -> str:
+    return _MOMENTUM_BUCKETS[idx][1].format(gap_percent, direction)
+
+
+def calculate_liquidity_score(volume: int, avg_volume: int, with_explanation: bool = True) -> Tuple[float, str]:
     """
     Calculate liquidity score based on volume ratio (today's volume / avg volume).
 
@@ -30,28 +155,22 @@ def calculate_liquidity_score(volume: int, avg_volume: int) -> Tuple[float, str]
     Args:
         volume: Today's trading volume
         avg_volume: Average daily volume (typically 20-day)
+        with_explanation: If False, skip formatting the explanation and return ""
 
     Returns:
         Tuple of (score, explanation)
     """
     if avg_volume == 0:
-        return 10.0, "No average volume data available"
+        return 10.0, "No average volume data available" if with_explanation else ""
 
     ratio = volume / avg_volume
-
-    if ratio > 2.0:
-        return 25.0, f"Exceptional volume ({ratio:.1f}x average) - high interest today"
-    elif ratio >= 1.5:
-        return 20.0, f"Excellent volume ({ratio:.1f}x average) - above normal trading"
-    elif ratio >= 1.0:
-        return 15.0, f"Good volume ({ratio:.1f}x average) - normal trading activity"
-    elif ratio >= 0.5:
-        return 10.0, f"Moderate volume ({ratio:.1f}x average) - below average interest"
-    else:
-        return 5.0, f"Low volume ({ratio:.1f}x average) - may be harder to enter/exit"
+    idx = bisect_right(_LIQUIDITY_THRESHOLDS, ratio)
+    if not with_explanation:
+        return _LIQUIDITY_BUCKETS[idx][0], ""
+    return _LIQUIDITY_BUCKETS[idx][0], _liquidity_explanation(idx, ratio)
 
 
-def calculate_spread_score(spread_percent: float) -> Tuple[float, str]:
+def calculate_spread_score(spread_percent: float, with_explanation: bool = True) -> Tuple[float, str]:
     """
     Calculate spread score based on bid-ask spread as percentage of price.
 
@@ -66,23 +185,18 @@ def calculate_spread_score(spread_percent: float) -> Tuple[float, str]:
 
     Args:
         spread_percent: Bid-ask spread as percentage of current price
+        with_explanation: If False, skip formatting the explanation and return ""
 
     Returns:
         Tuple of (score, explanation)
     """
-    if spread_percent < 0.05:
-        return 25.0, f"Excellent spread ({spread_percent:.3f}%) - minimal slippage"
-    elif spread_percent < 0.10:
-        return 20.0, f"Good spread ({spread_percent:.3f}%) - acceptable for day trading"
-    elif spread_percent < 0.20:
-        return 15.0, f"Moderate spread ({spread_percent:.3f}%) - watch entry/exit carefully"
-    elif spread_percent < 0.50:
-        return 10.0, f"Wide spread ({spread_percent:.3f}%) - significant slippage risk"
-    else:
-        return 5.0, f"Very wide spread ({spread_percent:.3f}%) - high cost to trade"
+    idx = bisect_right(_SPREAD_THRESHOLDS, spread_percent)
+    if not with_explanation:
+        return _SPREAD_BUCKETS[idx][0], ""
+    return _SPREAD_BUCKETS[idx][0], _spread_explanation(idx, spread_percent)
 
 
-def calculate_volatility_score(volatility_percent: float) -> Tuple[float, str]:
+def calculate_volatility_score(volatility_percent: float, with_explanation: bool = True) -> Tuple[float, str]:
     """
     Calculate volatility score based on intraday price range as % of open.
 
@@ -97,23 +211,18 @@ def calculate_volatility_score(volatility_percent: float) -> Tuple[float, str]:
 
     Args:
         volatility_percent: (high - low) / open * 100
+        with_explanation: If False, skip formatting the explanation and return ""
 
     Returns:
         Tuple of (score, explanation)
     """
-    if 2.0 <= volatility_percent <= 4.0:
-        return 25.0, f"Ideal volatility ({volatility_percent:.1f}%) - good movement for day trading"
-    elif (1.0 <= volatility_percent < 2.0) or (4.0 < volatility_percent <= 6.0):
-        return 20.0, f"Good volatility ({volatility_percent:.1f}%) - workable for day trading"
-    elif (0.5 <= volatility_percent < 1.0) or (6.0 < volatility_percent <= 8.0):
-        return 15.0, f"Moderate volatility ({volatility_percent:.1f}%) - proceed with caution"
-    elif volatility_percent < 0.5:
-        return 10.0, f"Low volatility ({volatility_percent:.1f}%) - limited profit potential"
-    else:
-        return 5.0, f"High volatility ({volatility_percent:.1f}%) - elevated risk"
+    idx = bisect_right(_VOLATILITY_THRESHOLDS, volatility_percent)
+    if not with_explanation:
+        return _VOLATILITY_BUCKETS[idx][0], ""
+    return _VOLATILITY_BUCKETS[idx][0], _volatility_explanation(idx, volatility_percent)
 
 
-def calculate_momentum_score(gap_percent: float) -> Tuple[float, str]:
+def calculate_momentum_score(gap_percent: float, with_explanation: bool = True) -> Tuple[float, str]:
     """
     Calculate momentum score based on gap from previous close.
 
@@ -127,24 +236,90 @@ def calculate_momentum_score(gap_percent: float) -> Tuple[float, str]:
 
     Args:
         gap_percent: (open - previous_close) / previous_close * 100 (absolute value)
+        with_explanation: If False, skip formatting the explanation and return ""
 
     Returns:
         Tuple of (score, explanation)
     """
-    abs_gap = abs(gap_percent)
-    direction = "up" if gap_percent >= 0 else "down"
+    idx = bisect_right(_MOMENTUM_THRESHOLDS, abs(gap_percent))
+    if not with_explanation:
+        return _MOMENTUM_BUCKETS[idx][0], ""
+    return _MOMENTUM_BUCKETS[idx][0], _momentum_explanation(idx, gap_percent)
+
 
-    if 1.0 <= abs_gap <= 3.0:
-        return 25.0, f"Ideal gap ({gap_percent:+.1f}% {direction}) - clear catalyst, not overdone"
-    elif (0.5 <= abs_gap < 1.0) or (3.0 < abs_gap <= 5.0):
-        return 20.0, f"Good gap ({gap_percent:+.1f}% {direction}) - momentum present"
-    elif abs_gap < 0.5:
-        return 15.0, f"Small gap ({gap_percent:+.1f}%) - no clear catalyst today"
+def _build_explanation(
+    total_score: float, liquidity_exp: str, spread_exp: str, volatility_exp: str, momentum_exp: str
+) -> str:
+    """Combine the overall assessment and the four factor explanations."""
+    explanations = [
+        f"Liquidity: {liquidity_exp}",
+        f"Spread: {spread_exp}",
+        f"Volatility: {volatility_exp}",
+        f"Momentum: {momentum_exp}"
+    ]
+
+    # Overall assessment
+    if total_score >= 80:
+        overall = "Excellent day trading candidate"
+    elif total_score >= 60:
+        overall = "Good candidate with some caution"
+    elif total_score >= 40:
+        overall = "Marginal - consider other options"
     else:
-        return 10.0, f"Large gap ({gap_percent:+.1f}% {direction}) - may be extended, watch for reversal"
+        overall = "Not recommended for day trading"
+
+    return f"{overall}. " + " | ".join(explanations)
+
+
+# Fetches every scoring input in one C-level call instead of five attribute lookups
+_score_inputs = attrgetter("volume", "avg_volume", "spread_percent", "volatility", "gap_percent")
 
 
-def calculate_day_trading_score(metrics: DayTradingMetrics) -> DayTradingScore:
+@lru_cache(maxsize=1024)
+def _score_core(
+    volume: int,
+    avg_volume: int,
+    spread_percent: float,
+    volatility: float,
+    gap_percent: float,
+    with_explanation: bool,
+    signs: Tuple[bool, ...] = (),
+) -> Tuple[float, float, float, float, float, str]:
+    """
+    Score one set of raw metrics.
+
+    Pure in its inputs, so symbols whose snapshot is unchanged between
+    consecutive scans are served from the cache. Without an explanation the
+    returned explanation is "".
+
+    signs only widens the cache key: explained calls pass the sign bits of
+    the float inputs so 0.0 and -0.0 (equal as keys) keep separate entries.
+
+    Returns:
+        Tuple of (liquidity, spread, volatility, momentum, total, explanation)
+    """
+    # Calculate each component score
+    liquidity_score, liquidity_exp = calculate_liquidity_score(
+        volume, avg_volume, with_explanation
+    )
+    spread_score, spread_exp = calculate_spread_score(spread_percent, with_explanation)
+    volatility_score, volatility_exp = calculate_volatility_score(volatility, with_explanation)
+    momentum_score, momentum_exp = calculate_momentum_score(gap_percent, with_explanation)
+
+    # Calculate total
+    total_score = liquidity_score + spread_score + volatility_score + momentum_score
+
+    scoring_explanation = ""
+    if with_explanation:
+        scoring_explanation = _build_explanation(total_score, liquidity_exp, spread_exp, volatility_exp, momentum_exp)
+
+    return liquidity_score, spread_score, volatility_score, momentum_score, total_score, scoring_explanation
+
+
+def calculate_day_trading_score(
+    metrics: DayTradingMetrics,
+    explain_min_score: Optional[float] = None,
+) -> DayTradingScore:
     """
     Calculate a comprehensive day trading suitability score for a stock.
 
@@ -164,40 +339,20 @@ def calculate_day_trading_score(metrics: DayTradingMetrics) -> DayTradingScore:
 
     Args:
         metrics: DayTradingMetrics with raw stock data
+        explain_min_score: If given, only totals reaching it get an explanation;
+            the numeric scores are computed first and lower ones get ""
 
     Returns:
         DayTradingScore with all component scores and explanations
     """
-    # Calculate each component score
-    liquidity_score, liquidity_exp = calculate_liquidity_score(
-        metrics.volume, metrics.avg_volume
-    )
-    spread_score, spread_exp = calculate_spread_score(metrics.spread_percent)
-    volatility_score, volatility_exp = calculate_volatility_score(metrics.volatility)
-    momentum_score, momentum_exp = calculate_momentum_score(metrics.gap_percent)
-
-    # Calculate total
-    total_score = liquidity_score + spread_score + volatility_score + momentum_score
-
-    # Build explanation
-    explanations = [
-        f"Liquidity: {liquidity_exp}",
-        f"Spread: {spread_exp}",
-        f"Volatility: {volatility_exp}",
-        f"Momentum: {momentum_exp}"
-    ]
-
-    # Overall assessment
-    if total_score >= 80:
-        overall = "Excellent day trading candidate"
-    elif total_score >= 60:
-        overall = "Good candidate with some caution"
-    elif total_score >= 40:
-        overall = "Marginal - consider other options"
-    else:
-        overall = "Not recommended for day trading"
-
-    scoring_explanation = f"{overall}. " + " | ".join(explanations)
+    inputs = _score_inputs(metrics)
+    explain = explain_min_score is None
+    if not explain:
+        result = _score_core(*inputs, False)
+        explain = result[4] >= explain_min_score
+    if explain:
+        result = _score_core(*inputs, True, tuple(map(_negative, inputs[2:])))
+    liquidity_score, spread_score, volatility_score, momentum_score, total_score, scoring_explanation = result
 
     return DayTradingScore(
         symbol=metrics.symbol,
@@ -211,6 +366,75 @@ def calculate_day_trading_score(metrics: DayTradingMetrics) -> DayTradingScore:
     )
 
 
+def calculate_day_trading_scores_batch(
+    metrics_list: List[DayTradingMetrics],
+    explain_min_score: float = 40.0,
+) -> List[DayTradingScore]:
+    """
+    Score many stocks at once; same results as calculate_day_trading_score.
+
+    The four factor scores are bucketed for all symbols in one kernel call
+    (see clarence.utils.scoring_fast). Explanation strings are only formatted for symbols whose
+    total reaches explain_min_score (callers filter the rest away); the
+    others get an empty scoring_explanation.
+
+    Args:
+        metrics_list: DayTradingMetrics with raw stock data
+        explain_min_score: Minimum total score that gets an explanation
+
+    Returns:
+        One DayTradingScore per input, in input order
+    """
+    n = len(metrics_list)
+    if n == 0:
+        return []
+
+    # One pass over the list; copy() makes each column contiguous for the kernel
+    columns = np.array([_score_inputs(m) for m in metrics_list], dtype=np.float64).T.copy()
+    volume, avg_volume, spread_pct, volatility, gap_pct = columns
+
+    has_avg = avg_volume != 0
+    ratio = np.divide(volume, avg_volume, out=np.zeros(n), where=has_avg)
+
+    # Momentum buckets on |gap| for every symbol; the sign only matters when
+    # wording the explanations of survivors
+    liq_idx, spr_idx, vty_idx, mom_idx = score_buckets(
+        ratio, spread_pct, volatility, np.abs(gap_pct), *_BUCKET_EDGES
+    )
+
+    liquidity = np.where(has_avg, _LIQUIDITY_POINTS[liq_idx], 10.0)
+    spread = _SPREAD_POINTS[spr_idx]
+    vty = _VOLATILITY_POINTS[vty_idx]
+    momentum = _MOMENTUM_POINTS[mom_idx]
+    total = liquidity + spread + vty + momentum
+
+    scores = []
+    for i, metrics in enumerate(metrics_list):
+        explanation = ""
+        if total[i] >= explain_min_score:
+            explanation = _build_explanation(
+                float(total[i]),
+                (
+                    _liquidity_explanation(int(liq_idx[i]), float(ratio[i]))
+                    if has_avg[i] else "No average volume data available"
+                ),
+                _spread_explanation(int(spr_idx[i]), metrics.spread_percent),
+                _volatility_explanation(int(vty_idx[i]), metrics.volatility),
+                _momentum_explanation(int(mom_idx[i]), metrics.gap_percent),
+            )
+        scores.append(DayTradingScore(
+            symbol=metrics.symbol,
+            total_score=float(total[i]),
+            liquidity_score=float(liquidity[i]),
+            spread_score=float(spread[i]),
+            volatility_score=float(vty[i]),
+            momentum_score=float(momentum[i]),
+            metrics=metrics,
+            scoring_explanation=explanation,
+        ))
+    return scores
+
+
 def format_score_breakdown(score: DayTradingScore) -> str:
     """
     Format a score breakdown for display to the user.
@@ -0,0 +1,205 @@
+"""
+Batched bar-metric and score-bucketing kernels for the scanner.
+
+Computes each candidate's latest volume, average volume, volume ratio,
+intraday volatility and gap from its daily bars in a single call over all
+symbols, instead of a Python loop of dict lookups per symbol, and buckets
+the four scoring factors for clarence.utils.scoring in one fused pass.
+
+Bars arrive as per-symbol NumPy OHLCV columns (see
+clarence.tools.get_stock_bars_batch) and are packed into flat float64
+columns plus an offsets array (symbol i owns rows offsets[i]:offsets[i + 1],
+oldest first). Both kernels are compiled with Numba when it is installed
+and fall back to vectorized NumPy otherwise; both paths produce identical
+results.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
+_EMPTY = np.zeros(0, dtype=np.float64)
+
+BarColumns = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+BarMetrics = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+BucketIndices = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def pack_bars(bar_columns: list[dict]) -> BarColumns:
+    """
+    Concatenate per-symbol OHLCV columns into flat columns plus offsets.
+
+    Args:
+        bar_columns: One {"open", "high", "low", "close", "volume"} dict of
+            float64 arrays per symbol (as returned by get_stock_bars_batch);
+            a missing or empty dict means the symbol has no bars
+
+    Returns:
+        Tuple of (open, high, low, close, volume, offsets) arrays
+    """
+    counts = np.fromiter((len(c.get("open", _EMPTY)) for c in bar_columns), dtype=np.int64, count=len(bar_columns))
+    offsets = np.zeros(len(bar_columns) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    def _column(name: str) -> np.ndarray:
+        return np.concatenate([_EMPTY, *(c.get(name, _EMPTY) for c in bar_columns)])
+
+    return _column("open"), _column("high"), _column("low"), _column("close"), _column("volume"), offsets
+
+
+def _bar_metrics_loop(open_, high, low, close, volume, offsets):
+    n = offsets.shape[0] - 1
+    vol_last = np.zeros(n, dtype=np.int64)
+    avg_volume = np.zeros(n, dtype=np.int64)
+    vol_ratio = np.ones(n, dtype=np.float64)
+    volatility = np.zeros(n, dtype=np.float64)
+    gap_pct = np.zeros(n, dtype=np.float64)
+
+    for i in range(n):
+        start = offsets[i]
+        end = offsets[i + 1]
+        count = end - start
+        if count == 0:
+            continue
+        last = end - 1
+        vol_last[i] = np.int64(volume[last])
+        if open_[last] > 0:
+            volatility[i] = (high[last] - low[last]) / open_[last] * 100
+
+        if count > 1:
+            total = 0.0
+            for j in range(start, last):
+                total += volume[j]
+            avg_volume[i] = np.int64(total // (count - 1))
+            prev_close = close[last - 1]
+            if prev_close > 0:
+                gap_pct[i] = (open_[last] - prev_close) / prev_close * 100
+
+        if avg_volume[i] > 0:
+            vol_ratio[i] = vol_last[i] / avg_volume[i]
+
+    return vol_last, avg_volume, vol_ratio, volatility, gap_pct
+
+
+def _bar_metrics_numpy(open_, high, low, close, volume, offsets):
+    counts = np.diff(offsets)
+    has_bars = counts > 0
+    has_prev = counts > 1
+    last = np.where(has_bars, offsets[1:] - 1, 0)
+    prev = np.where(has_prev, last - 1, 0)
+
+    if volume.size == 0:
+        n = counts.size
+        return (np.zeros(n, dtype=np.int64), np.zeros(n, dtype=np.int64),
+                np.ones(n), np.zeros(n), np.zeros(n))
+
+    vol_last = np.where(has_bars, volume[last], 0).astype(np.int64)
+
+    # Sum of each symbol's volumes before its latest bar, via prefix sums
+    prefix = np.concatenate(([0.0], np.cumsum(volume)))
+    prior_total = prefix[last] - prefix[offsets[:-1]]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_volume = np.where(has_prev, prior_total // np.maximum(counts - 1, 1), 0).astype(np.int64)
+
+        opens = open_[last]
+        volatility = np.where(has_bars & (opens > 0), (high[last] - low[last]) / opens * 100, 0.0)
+
+        prev_close = close[prev]
+        gap_pct = np.where(has_prev & (prev_close > 0), (opens - prev_close) / prev_close * 100, 0.0)
+
+        vol_ratio = np.where(avg_volume > 0, vol_last / np.maximum(avg_volume, 1), 1.0)
+
+    return vol_last, avg_volume, vol_ratio, volatility, gap_pct
+
+
+_kernel = njit(cache=True)(_bar_metrics_loop) if njit else _bar_metrics_numpy
+
+
+def bar_metrics(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    offsets: np.ndarray,
+) -> BarMetrics:
+    """
+    Compute day-trading bar metrics for every symbol in one call.
+
+    Args:
+        open_, high, low, close, volume: Flat float64 bar columns (see pack_bars)
+        offsets: int64 array; symbol i owns rows offsets[i]:offsets[i + 1]
+
+    Returns:
+        Tuple of (volume, avg_volume, volume_ratio, volatility, gap_percent)
+        arrays, one entry per symbol
+    """
+    return _kernel(open_, high, low, close, volume, offsets)
+
+
+def _bucket(x, edges):
+    # bisect_right for a handful of sorted edges; NaN falls into the last bucket
+    idx = 0
+    while idx < edges.shape[0] and not x < edges[idx]:
+        idx += 1
+    return idx
+
+
+def _score_buckets_loop(ratio, spread_pct, volatility, abs_gap, liq_edges, spr_edges, vty_edges, mom_edges):
+    n = ratio.shape[0]
+    liq_idx = np.empty(n, dtype=np.int64)
+    spr_idx = np.empty(n, dtype=np.int64)
+    vty_idx = np.empty(n, dtype=np.int64)
+    mom_idx = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        liq_idx[i] = _bucket(ratio[i], liq_edges)
+        spr_idx[i] = _bucket(spread_pct[i], spr_edges)
+        vty_idx[i] = _bucket(volatility[i], vty_edges)
+        mom_idx[i] = _bucket(abs_gap[i], mom_edges)
+    return liq_idx, spr_idx, vty_idx, mom_idx
+
+
+def _score_buckets_numpy(ratio, spread_pct, volatility, abs_gap, liq_edges, spr_edges, vty_edges, mom_edges):
+    # searchsorted(side="right") is the vectorized bisect_right
+    return (
+        np.searchsorted(liq_edges, ratio, side="right"),
+        np.searchsorted(spr_edges, spread_pct, side="right"),
+        np.searchsorted(vty_edges, volatility, side="right"),
+        np.searchsorted(mom_edges, abs_gap, side="right"),
+    )
+
+
+if njit:
+    _bucket = njit(cache=True)(_bucket)
+    _score_kernel = njit(cache=True)(_score_buckets_loop)
+else:
+    _score_kernel = _score_buckets_numpy
+
+
+def score_buckets(
+    ratio: np.ndarray,
+    spread_pct: np.ndarray,
+    volatility: np.ndarray,
+    abs_gap: np.ndarray,
+    liq_edges: np.ndarray,
+    spr_edges: np.ndarray,
+    vty_edges: np.ndarray,
+    mom_edges: np.ndarray,
+) -> BucketIndices:
+    """
+    Bucket the four scoring factors for every symbol in one call.
+
+    Args:
+        ratio, spread_pct, volatility, abs_gap: float64 factor inputs, one per symbol
+        liq_edges, spr_edges, vty_edges, mom_edges: Sorted float64 bucket edges
+
+    Returns:
+        Tuple of int64 bucket-index arrays (liquidity, spread, volatility, momentum),
+        each equal to bisect_right(edges, value)
+    """
+    return _score_kernel(ratio, spread_pct, volatility, abs_gap, liq_edges, spr_edges, vty_edges, mom_edges)
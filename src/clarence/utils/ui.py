@@ -1,59 +1,146 @@
+import asyncio
+import os
 import sys
-import time
+import textwrap
 import threading
-from contextlib import contextmanager
-from typing import Optional, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional, Callable, Iterator, List
 from functools import wraps
+from types import SimpleNamespace
 
 
-class Colors:
-    BLUE = "\033[38;2;222;124;60m"  # Claude Orange
-    CYAN = "\033[38;2;255;165;0m"   # Lighter orange for contrast
-    GREEN = "\033[92m"
-    YELLOW = "\033[93m"
-    RED = "\033[91m"
-    MAGENTA = "\033[95m"
-    ENDC = "\033[0m"
-    BOLD = "\033[1m"
-    DIM = "\033[2m"
-    WHITE = "\033[97m"
-    LIGHT_BLUE = "\033[38;2;222;124;60m"  # Same as CLARENCE ASCII art (Claude Orange)
+# A namespace instance rather than a class: attribute reads hit the
+# instance dict directly instead of the type's attribute lookup
+Colors = SimpleNamespace(
+    BLUE="\033[38;2;222;124;60m",  # Claude Orange
+    CYAN="\033[38;2;255;165;0m",   # Lighter orange for contrast
+    GREEN="\033[92m",
+    YELLOW="\033[93m",
+    RED="\033[91m",
+    MAGENTA="\033[95m",
+    ENDC="\033[0m",
+    BOLD="\033[1m",
+    DIM="\033[2m",
+    WHITE="\033[97m",
+    LIGHT_BLUE="\033[38;2;222;124;60m",  # Same as CLARENCE ASCII art (Claude Orange)
+)
+
+# Plain output when piped/redirected or when NO_COLOR is set (https://no-color.org).
+# Decided once at import, before anything below bakes the codes into strings.
+if os.environ.get("NO_COLOR") or not (sys.stdout and sys.stdout.isatty()):
+    for _name in vars(Colors):
+        setattr(Colors, _name, "")
+
+
+# Answer box pieces; fixed for the process, so built once instead of per row
+_BOX_WIDTH = 80
+_BAR = f"{Colors.BLUE}║{Colors.ENDC}"
+_TOP_BORDER = f"{Colors.BOLD}{Colors.BLUE}╔{'═' * (_BOX_WIDTH - 2)}╗{Colors.ENDC}"
+_TITLE_ROW = f"{Colors.BOLD}{Colors.BLUE}║{'ANSWER'.center(_BOX_WIDTH - 2)}║{Colors.ENDC}"
+_SEP_ROW = f"{Colors.BLUE}╠{'═' * (_BOX_WIDTH - 2)}╣{Colors.ENDC}"
+_EMPTY_ROW = f"{_BAR}{' ' * (_BOX_WIDTH - 2)}{_BAR}"
+# Content row; the format spec pads the text to the box's inner width
+_ROW_FMT = f"{_BAR} {{:<{_BOX_WIDTH - 4}}} {_BAR}\n"
+_BOTTOM_BORDER = f"{Colors.BOLD}{Colors.BLUE}╚{'═' * (_BOX_WIDTH - 2)}╝{Colors.ENDC}"
+_BOX_HEAD = f"\n{_TOP_BORDER}\n{_TITLE_ROW}\n{_SEP_ROW}\n"
+_BOX_FOOT = f"{_EMPTY_ROW}\n{_BOTTOM_BORDER}\n\n"
+
+
+def _write_raw(text: str):
+    """Write and flush text through stdout's byte buffer in one encode + write.
+
+    Skips TextIOWrapper's per-write encoding and line-buffering work on the
+    streaming hot path. Falls back to a plain write when stdout has no byte
+    buffer (e.g. redirected to a StringIO).
+    """
+    stream = sys.stdout
+    buffer = getattr(stream, "buffer", None)
+    if buffer is None:
+        stream.write(text)
+        stream.flush()
+        return
+    stream.flush()  # keep ordering with anything already written as text
+    buffer.write(text.encode(stream.encoding or "utf-8", stream.errors or "strict"))
+    buffer.flush()
+
+
+def _end_plain_stream(text: str):
+    """Finish an unboxed answer on its own line."""
+    sys.stdout.write("\n" if text.endswith("\n") else "\n\n")
+    sys.stdout.flush()
 
 
 class Spinner:
     """An animated spinner that runs in a separate thread."""
     
-    FRAMES = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
+    FRAMES = ("⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏")
+
+    # A Spinner is created per progress block; slots skip the per-instance __dict__
+    __slots__ = ("message", "color", "running", "thread", "_stop_event", "_task", "_frame_strings")
     
     def __init__(self, message: str = "", color: str = Colors.CYAN):
         self.message = message
         self.color = color
         self.running = False
         self.thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._rebuild_frames()
+
+    def _rebuild_frames(self):
+        """Pre-render every frame for the current color and message."""
+        # Replaced as a whole list, so the animation thread never sees a partial update
+        self._frame_strings = [f"\r{self.color}{frame}{Colors.ENDC} {self.message}" for frame in self.FRAMES]
         
     def _animate(self):
         """Animation loop that runs in a separate thread."""
         idx = 0
-        while self.running:
-            frame = self.FRAMES[idx % len(self.FRAMES)]
-            sys.stdout.write(f"\r{self.color}{frame}{Colors.ENDC} {self.message}")
+        # wait() returns as soon as stop() sets the event, not at the next tick
+        while not self._stop_event.is_set():
+            frames = self._frame_strings
+            sys.stdout.write(frames[idx % len(frames)])
+            sys.stdout.flush()
+            if self._stop_event.wait(0.08):
+                break
+            idx += 1
+
+    async def _animate_async(self):
+        """Animation loop that runs as a task on the current event loop."""
+        idx = 0
+        while True:
+            frames = self._frame_strings
+            sys.stdout.write(frames[idx % len(frames)])
             sys.stdout.flush()
-            time.sleep(0.08)
+            await asyncio.sleep(0.08)
             idx += 1
     
     def start(self):
         """Start the spinner animation."""
         if not self.running:
             self.running = True
+            self._stop_event.clear()
             self.thread = threading.Thread(target=self._animate, daemon=True)
             self.thread.start()
+
+    def start_async(self):
+        """Start the spinner as an asyncio task instead of a thread (needs a running loop)."""
+        if not self.running:
+            self.running = True
+            self._task = asyncio.create_task(self._animate_async())
     
     def stop(self, final_message: str = "", symbol: str = "✓", symbol_color: str = Colors.GREEN):
         """Stop the spinner and optionally show a completion message."""
         if self.running:
             self.running = False
+            if self._task:
+                # The task is parked in asyncio.sleep while we run, so it can't
+                # write another frame after this; no need to await it
+                self._task.cancel()
+                self._task = None
             if self.thread:
+                self._stop_event.set()
                 self.thread.join()
+                self.thread = None
             # Clear the line
             sys.stdout.write("\r" + " " * (len(self.message) + 10) + "\r")
             if final_message:
@@ -63,6 +150,7 @@ class Spinner:
     def update_message(self, message: str):
         """Update the spinner message."""
         self.message = message
+        self._rebuild_frames()
 
 
 def show_progress(message: str, success_message: str = ""):
@@ -86,6 +174,43 @@ def show_progress(message: str, success_message: str = ""):
     return decorator
 
 
+class _LineBuffer:
+    """Buffers streamed text and hands back completed lines wrapped to width.
+
+    Text is only wrapped at newlines or once the buffer outgrows a line, so
+    wrapping runs per line in textwrap instead of per character. The last,
+    possibly unfinished, wrapped line is carried over to the next chunk.
+    """
+
+    def __init__(self, width: int):
+        self.width = width
+        self.wrapper = textwrap.TextWrapper(width=width, break_long_words=True)
+        self.buffer = ""
+
+    def feed(self, chunk: str) -> List[str]:
+        """Add a chunk and return the lines it completed."""
+        self.buffer += chunk
+        lines: List[str] = []
+        if "\n" in chunk:
+            *complete, self.buffer = self.buffer.split("\n")
+            for line in complete:
+                lines.extend(self.wrapper.wrap(line) or [""])
+        if len(self.buffer) > self.width:
+            wrapped = self.wrapper.wrap(self.buffer)
+            if wrapped:
+                carry = wrapped.pop()
+                # Keep a trailing space so the next chunk starts a new word
+                self.buffer = carry + " " if self.buffer[-1].isspace() else carry
+                lines.extend(wrapped)
+        return lines
+
+    def flush(self) -> List[str]:
+        """Return whatever is left as the final line(s)."""
+        lines = self.wrapper.wrap(self.buffer) or [""]
+        self.buffer = ""
+        return lines
+
+
 class UI:
     """Interactive UI for displaying agent progress and results."""
     
@@ -95,9 +220,24 @@ class UI:
     @contextmanager
     def progress(self, message: str, success_message: str = ""):
         """Context manager for showing progress with a spinner."""
+        with self._spinner(message, success_message, Spinner.start) as spinner:
+            yield spinner
+
+    @asynccontextmanager
+    async def async_progress(self, message: str, success_message: str = ""):
+        """Like progress(), but the spinner is an event-loop task rather than a thread.
+
+        Only for blocks that await their work; anything that blocks the loop
+        also freezes the spinner.
+        """
+        with self._spinner(message, success_message, Spinner.start_async) as spinner:
+            yield spinner
+
+    @contextmanager
+    def _spinner(self, message: str, success_message: str, start: Callable[[Spinner], None]):
         spinner = Spinner(message, color=Colors.CYAN)
         self.current_spinner = spinner
-        spinner.start()
+        start(spinner)
         try:
             yield spinner
             spinner.stop(success_message or message.replace("...", " ✓"), symbol="✓", symbol_color=Colors.GREEN)
@@ -108,6 +248,7 @@ class UI:
             spinner.stop(f"Failed: {str(e)}", symbol="✗", symbol_color=Colors.RED)
             raise
         finally:
+            spinner.stop()  # no-op unless cancelled mid-block
             self.current_spinner = None
     
     def print_header(self, text: str):
@@ -122,13 +263,11 @@ class UI:
         """Print a clean list of planned tasks."""
         if not tasks:
             return
-        self.print_header("Planned Tasks")
-        for i, task in enumerate(tasks):
-            status = "+"
-            color = Colors.DIM
-            desc = task.get('description', task)
-            print(f"{Colors.BLUE}│{Colors.ENDC} {color}{status}{Colors.ENDC} {desc}")
-        print(f"{Colors.BLUE}╰{'─' * 50}{Colors.ENDC}\n")
+        header = f"\n{Colors.BOLD}{Colors.BLUE}╭─ Planned Tasks{Colors.ENDC}"
+        rows = [f"{Colors.BLUE}│{Colors.ENDC} {Colors.DIM}+{Colors.ENDC} {task.get('description', task)}" for task in tasks]
+        footer = f"{Colors.BLUE}╰{'─' * 50}{Colors.ENDC}\n"
+        # One write for the whole list instead of a print() per task
+        sys.stdout.write(f"{header}\n" + "\n".join(rows) + f"\n{footer}\n")
     
     def print_task_start(self, task_desc: str):
         """Print when starting a task."""
@@ -154,98 +293,51 @@ class UI:
     
     def print_answer(self, answer: str):
         """Print the final answer in a beautiful box."""
-        width = 80
-        
-        # Top border
-        print(f"\n{Colors.BOLD}{Colors.BLUE}╔{'═' * (width - 2)}╗{Colors.ENDC}")
-        
-        # Title
-        title = "ANSWER"
-        padding = (width - len(title) - 2) // 2
-        print(f"{Colors.BOLD}{Colors.BLUE}║{' ' * padding}{title}{' ' * (width - len(title) - padding - 2)}║{Colors.ENDC}")
-        
-        # Separator
-        print(f"{Colors.BLUE}╠{'═' * (width - 2)}╣{Colors.ENDC}")
+        sys.stdout.write(_BOX_HEAD)
         
         # Answer content with proper line wrapping
-        print(f"{Colors.BLUE}║{Colors.ENDC}{' ' * (width - 2)}{Colors.BLUE}║{Colors.ENDC}")
+        lines = [""]
         for line in answer.split('\n'):
-            if len(line) == 0:
-                print(f"{Colors.BLUE}║{Colors.ENDC}{' ' * (width - 2)}{Colors.BLUE}║{Colors.ENDC}")
-            else:
-                # Word wrap long lines
-                words = line.split()
-                current_line = ""
-                for word in words:
-                    if len(current_line) + len(word) + 1 <= width - 6:
-                        current_line += word + " "
-                    else:
-                        if current_line:
-                            print(f"{Colors.BLUE}║{Colors.ENDC} {current_line.ljust(width - 4)} {Colors.BLUE}║{Colors.ENDC}")
-                        current_line = word + " "
-                if current_line:
-                    print(f"{Colors.BLUE}║{Colors.ENDC} {current_line.ljust(width - 4)} {Colors.BLUE}║{Colors.ENDC}")
-        
-        print(f"{Colors.BLUE}║{Colors.ENDC}{' ' * (width - 2)}{Colors.BLUE}║{Colors.ENDC}")
+            lines.extend(textwrap.wrap(line, width=_BOX_WIDTH - 6) or [""])
+        self._print_box_lines(lines)
         
-        # Bottom border
-        print(f"{Colors.BOLD}{Colors.BLUE}╚{'═' * (width - 2)}╝{Colors.ENDC}\n")
+        sys.stdout.write(_BOX_FOOT)
     
     async def async_stream_answer(self, async_text_chunks) -> str:
-        """Stream answer from an async iterator and display in a box."""
-        width = 80
-
-        print(f"\n{Colors.BOLD}{Colors.BLUE}\u2554{'═' * (width - 2)}\u2557{Colors.ENDC}")
-        title = "ANSWER"
-        padding = (width - len(title) - 2) // 2
-        print(f"{Colors.BOLD}{Colors.BLUE}\u2551{' ' * padding}{title}{' ' * (width - len(title) - padding - 2)}\u2551{Colors.ENDC}")
-        print(f"{Colors.BLUE}\u2560{'═' * (width - 2)}\u2563{Colors.ENDC}")
-        print(f"{Colors.BLUE}\u2551{Colors.ENDC}", end="", flush=True)
+        """
+        Stream answer from an async iterator and display in a box.
 
+        The box opens on the first non-empty chunk, so a stream that yields no
+        text (e.g. a tool-calling turn) prints nothing.
+        """
         accumulated_text = ""
-        current_line = ""
+
+        if not sys.stdout.isatty():
+            # Piped or redirected: skip the box and wrapping, pass the text through
+            async for chunk in async_text_chunks:
+                accumulated_text += chunk
+                sys.stdout.write(chunk)
+            if accumulated_text:
+                _end_plain_stream(accumulated_text)
+            return accumulated_text
+
+        lines = _LineBuffer(_BOX_WIDTH - 6)
 
         try:
             async for chunk in async_text_chunks:
+                if not chunk:
+                    continue
+                if not accumulated_text:
+                    sys.stdout.write(_BOX_HEAD)
+                    sys.stdout.flush()
                 accumulated_text += chunk
-                for char in chunk:
-                    if char == '\n':
-                        padding_needed = max(0, width - 4 - len(current_line))
-                        print(f" {current_line}{' ' * padding_needed} {Colors.BLUE}\u2551{Colors.ENDC}")
-                        print(f"{Colors.BLUE}\u2551{Colors.ENDC}", end="", flush=True)
-                        current_line = ""
-                    else:
-                        current_line += char
-                        if len(current_line) >= width - 6:
-                            last_space = current_line.rfind(' ', 0, width - 6)
-                            if last_space > 0:
-                                line_to_print = current_line[:last_space]
-                                padding_needed = width - 4 - len(line_to_print)
-                                print(f" {line_to_print}{' ' * padding_needed} {Colors.BLUE}\u2551{Colors.ENDC}")
-                                print(f"{Colors.BLUE}\u2551{Colors.ENDC}", end="", flush=True)
-                                current_line = current_line[last_space + 1:]
-                            else:
-                                line_to_print = current_line[:width - 6]
-                                padding_needed = width - 4 - len(line_to_print)
-                                print(f" {line_to_print}{' ' * padding_needed} {Colors.BLUE}\u2551{Colors.ENDC}")
-                                print(f"{Colors.BLUE}\u2551{Colors.ENDC}", end="", flush=True)
-                                current_line = current_line[width - 6:]
-
-            if current_line:
-                padding_needed = max(0, width - 4 - len(current_line))
-                print(f" {current_line}{' ' * padding_needed} {Colors.BLUE}\u2551{Colors.ENDC}")
-            else:
-                print(f"{' ' * (width - 2)}{Colors.BLUE}\u2551{Colors.ENDC}")
-        except Exception:
-            if current_line:
-                padding_needed = max(0, width - 4 - len(current_line))
-                print(f" {current_line}{' ' * padding_needed} {Colors.BLUE}\u2551{Colors.ENDC}")
-            else:
-                print(f"{' ' * (width - 2)}{Colors.BLUE}\u2551{Colors.ENDC}")
-            raise
+                self._print_box_lines(lines.feed(chunk))
+        finally:
+            if accumulated_text:
+                self._print_box_lines(lines.flush())
 
-        print(f"{Colors.BLUE}\u2551{Colors.ENDC}{' ' * (width - 2)}{Colors.BLUE}\u2551{Colors.ENDC}")
-        print(f"{Colors.BOLD}{Colors.BLUE}\u255a{'═' * (width - 2)}\u255d{Colors.ENDC}\n")
+        if accumulated_text:
+            sys.stdout.write(_BOX_FOOT)
 
         return accumulated_text
 
@@ -254,82 +346,38 @@ class UI:
         Stream answer text chunks and display them in a beautiful box.
         Returns the complete accumulated text.
         """
-        width = 80
-        
-        # Top border
-        print(f"\n{Colors.BOLD}{Colors.BLUE}╔{'═' * (width - 2)}╗{Colors.ENDC}")
-        
-        # Title
-        title = "ANSWER"
-        padding = (width - len(title) - 2) // 2
-        print(f"{Colors.BOLD}{Colors.BLUE}║{' ' * padding}{title}{' ' * (width - len(title) - padding - 2)}║{Colors.ENDC}")
-        
-        # Separator
-        print(f"{Colors.BLUE}╠{'═' * (width - 2)}╣{Colors.ENDC}")
-        
-        # Start content area - print first line border
-        print(f"{Colors.BLUE}║{Colors.ENDC}", end="", flush=True)
+        if not sys.stdout.isatty():
+            # Piped or redirected: skip the box and wrapping, pass the text through
+            accumulated_text = ""
+            for chunk in text_chunks:
+                accumulated_text += chunk
+                sys.stdout.write(chunk)
+            _end_plain_stream(accumulated_text)
+            return accumulated_text
+
+        sys.stdout.write(_BOX_HEAD)
+        sys.stdout.flush()
         
         accumulated_text = ""
-        current_line = ""
+        lines = _LineBuffer(_BOX_WIDTH - 6)
         
         try:
             for chunk in text_chunks:
                 accumulated_text += chunk
-                
-                # Process chunk character by character
-                for char in chunk:
-                    if char == '\n':
-                        # Print current line with proper padding and border
-                        padding_needed = max(0, width - 4 - len(current_line))
-                        print(f" {current_line}{' ' * padding_needed} {Colors.BLUE}║{Colors.ENDC}")
-                        # Start next line
-                        print(f"{Colors.BLUE}║{Colors.ENDC}", end="", flush=True)
-                        current_line = ""
-                    else:
-                        current_line += char
-                        
-                        # Check if line needs wrapping (simple word wrap)
-                        if len(current_line) >= width - 6:
-                            # Try to find last space for word wrap
-                            last_space = current_line.rfind(' ', 0, width - 6)
-                            if last_space > 0:
-                                # Wrap at word boundary
-                                line_to_print = current_line[:last_space]
-                                padding_needed = width - 4 - len(line_to_print)
-                                print(f" {line_to_print}{' ' * padding_needed} {Colors.BLUE}║{Colors.ENDC}")
-                                print(f"{Colors.BLUE}║{Colors.ENDC}", end="", flush=True)
-                                current_line = current_line[last_space + 1:]
-                            else:
-                                # No space found, wrap at character boundary
-                                line_to_print = current_line[:width - 6]
-                                padding_needed = width - 4 - len(line_to_print)
-                                print(f" {line_to_print}{' ' * padding_needed} {Colors.BLUE}║{Colors.ENDC}")
-                                print(f"{Colors.BLUE}║{Colors.ENDC}", end="", flush=True)
-                                current_line = current_line[width - 6:]
-            
-            # Print any remaining content on the current line
-            if current_line:
-                padding_needed = max(0, width - 4 - len(current_line))
-                print(f" {current_line}{' ' * padding_needed} {Colors.BLUE}║{Colors.ENDC}")
-            else:
-                # Empty line at end
-                print(f"{' ' * (width - 2)}{Colors.BLUE}║{Colors.ENDC}")
-        except Exception as e:
-            # On error, print remaining content
-            if current_line:
-                padding_needed = max(0, width - 4 - len(current_line))
-                print(f" {current_line}{' ' * padding_needed} {Colors.BLUE}║{Colors.ENDC}")
-            else:
-                print(f"{' ' * (width - 2)}{Colors.BLUE}║{Colors.ENDC}")
-            raise
+                self._print_box_lines(lines.feed(chunk))
+        finally:
+            # Print any remaining content, even if the stream failed
+            self._print_box_lines(lines.flush())
         
-        # Bottom border
-        print(f"{Colors.BLUE}║{Colors.ENDC}{' ' * (width - 2)}{Colors.BLUE}║{Colors.ENDC}")
-        print(f"{Colors.BOLD}{Colors.BLUE}╚{'═' * (width - 2)}╝{Colors.ENDC}\n")
+        sys.stdout.write(_BOX_FOOT)
         
         return accumulated_text
     
+    def _print_box_lines(self, lines: List[str]):
+        """Print wrapped lines as rows of the answer box in one write."""
+        if lines:
+            _write_raw("".join(map(_ROW_FMT.format, lines)))
+
     def print_info(self, message: str):
         """Print an info message."""
         print(f"{Colors.DIM}{message}{Colors.ENDC}")
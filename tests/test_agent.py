@@ -0,0 +1,14 @@
+from clarence.agent import _tool_key
+
+
+def test_tool_key_ignores_nested_key_order():
+    assert _tool_key("get_news", {"a": {"x": 1, "y": 2}, "b": 1}) == _tool_key(
+        "get_news", {"b": 1, "a": {"y": 2, "x": 1}}
+    )
+
+
+def test_tool_key_handles_integers_beyond_64_bits():
+    big = {"q": 2**70, "nested": {"z": 1, "a": -(2**70)}}
+
+    assert _tool_key("get_news", big) == _tool_key("get_news", {"nested": {"a": -(2**70), "z": 1}, "q": 2**70})
+    assert _tool_key("get_news", big) != _tool_key("get_news", {"q": 2**70 + 1, "nested": {"z": 1, "a": -(2**70)}})
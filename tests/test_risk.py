@@ -0,0 +1,19 @@
+import numpy as np
+
+from clarence.risk import calculate_position_size, calculate_position_sizes, get_risk_parameters
+
+
+def test_position_sizes_match_scalar():
+    params = get_risk_parameters("medium")
+    prices = [0.0, -5.0, 0.37, 1.0, 12.5, 99.99, 250.0, 10_000.0, 1e9]
+
+    sizes = calculate_position_sizes(25_000.0, params, np.array(prices))
+
+    assert sizes.dtype == np.int64
+    assert sizes.tolist() == [calculate_position_size(25_000.0, params, p) for p in prices]
+
+
+def test_position_sizes_empty():
+    sizes = calculate_position_sizes(1_000.0, get_risk_parameters("low"), np.array([]))
+
+    assert sizes.shape == (0,)
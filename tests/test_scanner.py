@@ -0,0 +1,46 @@
+from clarence.risk import get_risk_parameters
+from clarence.scanner import OpportunityScanner
+from clarence.schemas import DayTradingMetrics
+from clarence.utils.logger import Logger
+from clarence.utils.scoring import calculate_day_trading_score
+
+
+def _scanner() -> OpportunityScanner:
+    return OpportunityScanner(mcp=None, risk_params=get_risk_parameters("medium"), logger=Logger())
+
+
+def _score(symbol: str):
+    metrics = DayTradingMetrics(
+        symbol=symbol,
+        current_price=10.0,
+        bid_price=9.99,
+        ask_price=10.01,
+        spread=0.02,
+        spread_percent=0.2,
+        volume=200,
+        avg_volume=100,
+    )
+    return calculate_day_trading_score(metrics)
+
+
+def test_parse_recommendations_bare_list_returns_empty():
+    scanner = _scanner()
+
+    assert scanner._parse_recommendations("[]", [_score("AAPL")]) == []
+    assert any("no JSON object" in line for line in scanner.logger.log)
+
+
+def test_parse_recommendations_ignores_surrounding_prose():
+    text = 'Here you go: {"recommendations": [{"symbol": "AAPL", "quantity": 3}]} Good luck.'
+
+    recs = _scanner()._parse_recommendations(text, [_score("AAPL")])
+
+    assert [(r.symbol, r.quantity) for r in recs] == [("AAPL", 3)]
+
+
+def test_parse_recommendations_bare_object():
+    text = '{"recommendations": [{"symbol": "AAPL", "quantity": 5}, {"symbol": "MSFT"}]}'
+
+    recs = _scanner()._parse_recommendations(text, [_score("AAPL")])
+
+    assert [(r.symbol, r.quantity) for r in recs] == [("AAPL", 5)]
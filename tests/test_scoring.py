@@ -0,0 +1,38 @@
+from clarence.schemas import DayTradingMetrics
+from clarence.utils.scoring import calculate_day_trading_score, calculate_day_trading_scores_batch
+
+
+def _metrics(value: float) -> DayTradingMetrics:
+    return DayTradingMetrics(
+        symbol="TEST",
+        current_price=10.0,
+        bid_price=10.0,
+        ask_price=10.0,
+        spread=0.0,
+        spread_percent=value,
+        volume=100,
+        avg_volume=100,
+        volatility=value,
+        gap_percent=value,
+    )
+
+
+def test_negative_zero_does_not_share_cached_explanation():
+    negative = calculate_day_trading_score(_metrics(-0.0)).scoring_explanation
+    positive = calculate_day_trading_score(_metrics(0.0)).scoring_explanation
+
+    assert "Excellent spread (-0.000%)" in negative
+    assert "Low volatility (-0.0%)" in negative
+    assert "Small gap (-0.0%)" in negative
+    assert "Excellent spread (0.000%)" in positive
+    assert "Low volatility (0.0%)" in positive
+    assert "Small gap (+0.0%)" in positive
+
+
+def test_batch_matches_scalar_for_signed_zeros():
+    metrics = [_metrics(-0.0), _metrics(0.0), _metrics(-0.0)]
+    batch = calculate_day_trading_scores_batch(metrics, explain_min_score=0.0)
+
+    assert [s.scoring_explanation for s in batch] == [
+        calculate_day_trading_score(m).scoring_explanation for m in metrics
+    ]